@@ -0,0 +1,106 @@
+"""
+Semantic Answer Cache - Reuse answers to near-identical questions
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from itertools import count
+import numpy as np
+
+class SemanticAnswerCache:
+    def __init__(self, threshold=0.92, ttl=3600, max_entries=1000):
+        """Cache keyed by (normalized skill set, question embedding)
+        
+        A lookup hits when a cached question for the same skill set has
+        cosine similarity >= threshold, is younger than ttl seconds and was
+        stored for the same data version.
+        Thread-safe, so one instance can be shared by every session.
+        """
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._by_skills = {}
+        self._ids = count()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def skills_key(skills, scope=""):
+        """Order- and case-insensitive fingerprint of a skill set (plus an optional scope)"""
+        canonical = sorted({skill.strip().lower() for skill in skills or []})
+        return hashlib.sha1("\x00".join([scope] + canonical).encode("utf-8")).hexdigest()
+    
+    def _remove(self, entry_id):
+        entry = self._entries.pop(entry_id)
+        ids = self._by_skills[entry["skills_key"]]
+        ids.remove(entry_id)
+        if not ids:
+            del self._by_skills[entry["skills_key"]]
+    
+    def lookup(self, skills, embedding, version=None, scope=""):
+        """Cached response for a similar question, or None
+        
+        scope separates answers produced differently (e.g. by retrieval mode);
+        version is the data (graph / corpus) the answer was built from, and
+        entries stored for another version are dropped.
+        """
+        key = self.skills_key(skills, scope)
+        query = np.asarray(embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        
+        with self._lock:
+            now = time.monotonic()
+            for entry_id in list(self._by_skills.get(key, [])):
+                entry = self._entries[entry_id]
+                if now - entry["created"] > self.ttl or entry["version"] != version:
+                    self._remove(entry_id)
+            
+            ids = self._by_skills.get(key)
+            if ids:
+                similarities = np.stack([self._entries[i]["embedding"] for i in ids]) @ query
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    entry_id = ids[best]
+                    self._entries.move_to_end(entry_id)
+                    self.hits += 1
+                    return self._entries[entry_id]["response"]
+            
+            self.misses += 1
+            return None
+    
+    def store(self, skills, embedding, response, version=None, scope=""):
+        """Remember a response, evicting the least recently used entries"""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        key = self.skills_key(skills, scope)
+        with self._lock:
+            entry_id = next(self._ids)
+            self._entries[entry_id] = {
+                "skills_key": key,
+                "embedding": embedding / (np.linalg.norm(embedding) or 1.0),
+                "response": response,
+                "version": version,
+                "created": time.monotonic()
+            }
+            self._by_skills.setdefault(key, []).append(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+    
+    def invalidate(self):
+        """Forget every cached answer"""
+        with self._lock:
+            self._entries.clear()
+            self._by_skills.clear()
+    
+    def stats(self):
+        """Hit-rate metrics"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries)
+            }
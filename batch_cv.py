@@ -0,0 +1,135 @@
+"""
+Batch CV Processing - Headless analysis of whole directories of CVs
+
+Usage:
+    python batch_cv.py ./cvs --out results.jsonl --workers 8
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from cv_parser import CVParser, make_person_id
+
+CV_EXTENSIONS = (".pdf", ".txt")
+
+def find_cv_files(root):
+    """All PDF/TXT files under root, in a stable order"""
+    paths = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.lower().endswith(CV_EXTENSIONS):
+                paths.append(os.path.join(dirpath, filename))
+    return sorted(paths)
+
+def parse_cv_file(path, max_pages=None, timeout=None):
+    """Worker: extract text from one CV and hash it into a person ID (runs in a child process)"""
+    start = time.perf_counter()
+    parser = CVParser()
+    if path.lower().endswith(".pdf"):
+        text = parser.parse_pdf(path, max_pages=max_pages, timeout=timeout)
+        stats = parser.last_stats
+    else:
+        text = parser.parse_text(path)
+        stats = {"pages": None, "timed_out": False, "error": None}
+    return path, make_person_id(path), text, time.perf_counter() - start, stats
+
+class StageTimer:
+    def __init__(self):
+        self.seconds = {}
+        self.items = {}
+    
+    def add(self, stage, seconds, items=1):
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+        self.items[stage] = self.items.get(stage, 0) + items
+    
+    def report(self, wall_seconds):
+        print("📊 Stage throughput:")
+        for stage, seconds in self.seconds.items():
+            rate = self.items[stage] / seconds if seconds > 0 else 0.0
+            print(f"  ↳ {stage:<8} {self.items[stage]:>7} items  {seconds:8.2f}s  {rate:10.1f}/sec")
+        print(f"✓ Wall time {wall_seconds:.2f}s")
+
+def flush(manager, pending, out, timer, write_profiles):
+    """Write one batch of profiles, score it and emit JSONL rows"""
+    if not pending:
+        return
+    profiles = [row for row in pending if row["skills"]]
+    
+    if write_profiles and profiles:
+        start = time.perf_counter()
+        manager.create_person_profiles(profiles)
+        timer.add("write", time.perf_counter() - start, len(profiles))
+    
+    # CVs without skills get no fields rather than every field at 0%
+    top_fields = {}
+    if profiles:
+        start = time.perf_counter()
+        scorer = manager.get_snapshot().scorer()
+        scored = scorer.top_fields_many([row["skills"] for row in profiles])
+        top_fields = {id(row): fields for row, fields in zip(profiles, scored)}
+        timer.add("score", time.perf_counter() - start, len(profiles))
+    
+    for row in pending:
+        row["top_fields"] = [{"field": field, "score": score} for field, score in top_fields.get(id(row), [])]
+        out.write(json.dumps(row, ensure_ascii=False) + "\n")
+    pending.clear()
+
+def run(args):
+    from neo4j_skills_manager import neo4j_skills
+    
+    paths = find_cv_files(args.input)
+    print(f"📂 Found {len(paths)} CV files in {args.input}")
+    timer = StageTimer()
+    parser = CVParser()
+    wall_start = time.perf_counter()
+    
+    with ProcessPoolExecutor(max_workers=args.workers) as executor, \
+            open(args.out, "w", encoding="utf-8") as out:
+        pending = []
+        worker = partial(parse_cv_file, max_pages=args.max_pages, timeout=args.timeout)
+        parsed = executor.map(worker, paths, chunksize=args.chunksize)
+        for path, person_id, text, parse_seconds, parse_stats in parsed:
+            timer.add("parse", parse_seconds)
+            
+            start = time.perf_counter()
+            skills = neo4j_skills.extract_cv_skills(text) if text else []
+            summary = parser.get_cv_summary(text)
+            timer.add("match", time.perf_counter() - start)
+            
+            pending.append({
+                "file": path,
+                "person_id": person_id,
+                "name": summary["name"],
+                "email": summary["email"],
+                "phone": summary["phone"],
+                "skills": skills,
+                "parse_seconds": round(parse_seconds, 4),
+                "pages": parse_stats["pages"],
+                "timed_out": parse_stats["timed_out"],
+                "error": parse_stats["error"] or (None if text else "no text extracted")
+            })
+            if len(pending) >= args.batch_size:
+                flush(neo4j_skills, pending, out, timer, not args.no_write)
+        
+        flush(neo4j_skills, pending, out, timer, not args.no_write)
+    
+    # Parse seconds are summed across worker processes, so compare them with wall time
+    timer.report(time.perf_counter() - wall_start)
+    print(f"✓ Wrote results to {args.out}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a directory of CVs")
+    parser.add_argument("input", help="directory containing PDF/TXT CVs")
+    parser.add_argument("--out", default="cv_results.jsonl", help="JSONL output file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="parser processes")
+    parser.add_argument("--chunksize", type=int, default=8, help="files handed to a worker at a time")
+    parser.add_argument("--max-pages", type=int, default=None, help="only read the first N pages of each PDF")
+    parser.add_argument("--timeout", type=float, default=None, help="hard per-file PDF extraction timeout in seconds (extraction is killed, partial pages kept)")
+    parser.add_argument("--batch-size", type=int, default=200, help="profiles per Neo4j write")
+    parser.add_argument("--no-write", action="store_true", help="do not create Person profiles")
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmarks - Measure graph query latency against graph size
+
+Usage:
+    python benchmark.py evaluate --fields 25 50 100 200
+
+Synthetic nodes are named with a "__bench__" prefix and removed afterwards.
+"""
+import argparse
+import statistics
+import time
+from graph_snapshot import SkillGraphSnapshot
+from neo4j_skills_manager import neo4j_skills
+
+BENCH_PREFIX = "__bench__"
+
+def make_dataset(n_fields, skills_per_field, skill_pool):
+    """Synthetic taxonomy: each field requires a sliding window of the pool"""
+    return [
+        {
+            "field": f"{BENCH_PREFIX}Field {i}",
+            "skills": [f"{BENCH_PREFIX}Skill {(i * 7 + j) % skill_pool}" for j in range(skills_per_field)],
+            "level": "Intermediate"
+        }
+        for i in range(n_fields)
+    ]
+
+def cleanup(manager):
+    """Remove every synthetic node created by the benchmark"""
+    with manager.driver.session() as session:
+        session.run("MATCH (n) WHERE n.name STARTS WITH $prefix DETACH DELETE n", prefix=BENCH_PREFIX)
+    manager.invalidate_snapshot()
+
+def legacy_evaluate_skills(manager, person_skills):
+    """Original per-field implementation (two queries per field), kept for comparison"""
+    with manager.driver.session() as session:
+        evaluation = []
+        result = session.run("MATCH (f:Field) RETURN DISTINCT f.name as field")
+        fields = [record["field"] for record in result]
+        for field in fields:
+            match_data = session.run("""
+                MATCH (s:Skill)-[:REQUIRED_FOR]->(f:Field {name: $field_name})
+                WHERE s.name IN $person_skills
+                RETURN count(s) as matched, collect(s.name) as matched_skills
+            """, field_name=field, person_skills=person_skills).single()
+            total_data = session.run("""
+                MATCH (s:Skill)-[:REQUIRED_FOR]->(f:Field {name: $field_name})
+                RETURN count(s) as total, collect(s.name) as all_skills
+            """, field_name=field).single()
+            if total_data["total"] > 0:
+                evaluation.append({
+                    "field": field,
+                    "matched_skills": match_data["matched_skills"],
+                    "total_required": total_data["total"],
+                    "score": round(match_data["matched"] / total_data["total"] * 100, 1),
+                    "missing_skills": [s for s in total_data["all_skills"] if s not in person_skills]
+                })
+        evaluation.sort(key=lambda x: x["score"], reverse=True)
+        return evaluation
+
+def timed(fn, repeat):
+    """Median wall time in milliseconds over `repeat` runs"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def load_snapshot(manager):
+    """Read the taxonomy and build its scorer: the cost paid after every graph change"""
+    with manager.driver.session() as session:
+        snapshot = session.execute_read(SkillGraphSnapshot.load)
+    snapshot.scorer()
+    return snapshot
+
+def bench_evaluate(args):
+    """Legacy per-field queries vs the snapshot path, both without memoization
+    
+    "load" is reading the snapshot and building its scorer, "evaluate" one
+    uncached scoring pass over a loaded snapshot; "cold" is their sum (the
+    first request after a graph change). Memoized repeats of evaluate_skills
+    are not measured: they are a dictionary lookup.
+    """
+    person_skills = [f"{BENCH_PREFIX}Skill {i}" for i in range(0, args.skill_pool, 3)][:args.person_skills]
+    print(f"{'fields':>8} {'legacy ms':>11} {'load ms':>9} {'evaluate ms':>12} {'cold ms':>9} "
+          f"{'cold speedup':>13} {'warm speedup':>13}")
+    try:
+        loaded = 0
+        for n_fields in sorted(args.fields):
+            dataset = make_dataset(n_fields, args.skills_per_field, args.skill_pool)[loaded:]
+            neo4j_skills.load_skills_dataset(dataset)
+            loaded = n_fields
+            
+            legacy_ms = timed(lambda: legacy_evaluate_skills(neo4j_skills, person_skills), args.repeat)
+            load_ms = timed(lambda: load_snapshot(neo4j_skills), args.repeat)
+            snapshot = load_snapshot(neo4j_skills)
+            evaluate_ms = timed(lambda: snapshot.scorer().evaluate(person_skills), args.repeat)
+            cold_ms = load_ms + evaluate_ms
+            print(f"{n_fields:>8} {legacy_ms:>11.1f} {load_ms:>9.1f} {evaluate_ms:>12.2f} {cold_ms:>9.1f} "
+                  f"{legacy_ms / cold_ms:>12.1f}x {legacy_ms / max(evaluate_ms, 1e-6):>12.1f}x")
+    finally:
+        cleanup(neo4j_skills)
+
+def main():
+    parser = argparse.ArgumentParser(description="Skills graph benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    
+    evaluate = subparsers.add_parser("evaluate", help="uncached skill evaluation latency vs field count")
+    evaluate.add_argument("--fields", type=int, nargs="+", default=[25, 50, 100, 200])
+    evaluate.add_argument("--skills-per-field", type=int, default=15)
+    evaluate.add_argument("--skill-pool", type=int, default=500)
+    evaluate.add_argument("--person-skills", type=int, default=20)
+    evaluate.add_argument("--repeat", type=int, default=5)
+    evaluate.set_defaults(func=bench_evaluate)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
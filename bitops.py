@@ -0,0 +1,11 @@
+"""
+Bit Operations - Popcount over numpy.packbits rows
+"""
+import numpy as np
+
+# Number of set bits for every byte value
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def row_popcount(packed):
+    """Set bits in each row of a packed uint8 matrix"""
+    return POPCOUNT[packed].sum(axis=1, dtype=np.int32)
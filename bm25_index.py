@@ -0,0 +1,89 @@
+"""
+BM25 Index - In-memory sparse inverted index over document text
+"""
+import re
+from collections import Counter
+import numpy as np
+
+# Keeps skill-like tokens intact: "c++", "c#", "node.js"
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+class BM25Index:
+    def __init__(self, k1=1.5, b=0.75):
+        """Okapi BM25 with postings appended as documents arrive"""
+        self.k1 = k1
+        self.b = b
+        self.clear()
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    def __contains__(self, doc_id):
+        return doc_id in self._id_to_doc
+    
+    def clear(self):
+        self.ids = []
+        self._id_to_doc = {}
+        self._doc_lengths = []
+        self._total_length = 0
+        # term -> ([doc numbers], [term frequencies])
+        self._postings = {}
+    
+    def add(self, ids, texts):
+        """Index documents (ids already present are skipped)"""
+        for doc_id, text in zip(ids, texts):
+            if doc_id in self._id_to_doc:
+                continue
+            doc = len(self.ids)
+            self.ids.append(doc_id)
+            self._id_to_doc[doc_id] = doc
+            tokens = tokenize(text or "")
+            self._doc_lengths.append(len(tokens))
+            self._total_length += len(tokens)
+            for term, tf in Counter(tokens).items():
+                docs, tfs = self._postings.setdefault(term, ([], []))
+                docs.append(doc)
+                tfs.append(tf)
+    
+    def search(self, query, k=10, allowed_ids=None):
+        """Top-k (id, BM25 score) pairs; allowed_ids restricts the candidates"""
+        n = len(self.ids)
+        terms = set(tokenize(query))
+        if n == 0 or k <= 0 or not terms:
+            return []
+        
+        lengths = np.asarray(self._doc_lengths, dtype=np.float32)
+        norm = self.k1 * (1 - self.b + self.b * lengths / (self._total_length / n or 1.0))
+        scores = np.zeros(n, dtype=np.float32)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            docs = np.asarray(postings[0], dtype=np.int64)
+            tfs = np.asarray(postings[1], dtype=np.float32)
+            idf = np.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm[docs])
+        
+        if allowed_ids is not None:
+            mask = np.zeros(n, dtype=bool)
+            mask[[self._id_to_doc[i] for i in allowed_ids if i in self._id_to_doc]] = True
+            scores[~mask] = 0.0
+        
+        matched = np.flatnonzero(scores > 0)
+        if len(matched) == 0:
+            return []
+        k = min(k, len(matched))
+        top = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        top = top[np.argsort(-scores[top])]
+        return [(self.ids[doc], float(scores[doc])) for doc in top]
+
+def reciprocal_rank_fusion(rankings, k=60):
+    """Fuse ranked [(id, score)] lists: score(id) = sum of 1 / (k + rank)"""
+    fused = {}
+    for ranking in rankings:
+        for rank, (doc_id, _) in enumerate(ranking, start=1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
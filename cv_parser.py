@@ -1,27 +1,156 @@
 """
 Simple CV Parser - Extract skills from CV documents
 """
+import hashlib
+import multiprocessing
+import queue
 import re
+import time
 from pypdf import PdfReader
 
+class PDFTimeoutError(Exception):
+    """Raised when a PDF takes longer than the allowed time to extract"""
+    def __init__(self, message, pages=None):
+        super().__init__(message)
+        self.pages = pages or []
+
+def _stream_page_range(file_path, start_page, count, out):
+    """Child process: send each page of a range as soon as it is extracted
+    
+    Puts ("page", (page_number, text, seconds)) per page, then ("done", None)
+    or ("error", message).
+    """
+    try:
+        for page in CVParser().iter_pages(file_path, max_pages=count, start_page=start_page):
+            out.put(("page", page))
+        out.put(("done", None))
+    except Exception as e:
+        out.put(("error", str(e)))
+
+def make_person_id(file_path):
+    """Stable person ID from the CV file's bytes
+    
+    The extracted "name" is just the first line (often "Curriculum Vitae"),
+    so it can't identify a person; the same file always gets the same ID.
+    """
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return f"person_{digest.hexdigest()[:16]}"
+
 class CVParser:
     def __init__(self):
         self.common_sections = [
             'skills', 'technical skills', 'expertise', 'competencies',
             'technologies', 'tools', 'programming languages'
         ]
+        self.last_stats = None
     
-    def parse_pdf(self, file_path):
-        """Extract text from PDF CV"""
+    def iter_pages(self, file_path, max_pages=None, timeout=None, start_page=0):
+        """Lazily yield (page_number, text, seconds) for each PDF page
+        
+        Stops after max_pages pages; raises PDFTimeoutError once more than
+        `timeout` seconds have been spent on the file (checked between pages).
+        """
+        started = time.perf_counter()
+        reader = PdfReader(file_path)
+        end_page = len(reader.pages)
+        if max_pages is not None:
+            end_page = min(end_page, start_page + max_pages)
+        
+        for page_number in range(start_page, end_page):
+            if timeout is not None and time.perf_counter() - started > timeout:
+                raise PDFTimeoutError(f"{file_path}: timed out after {page_number - start_page} pages")
+            page_start = time.perf_counter()
+            text = reader.pages[page_number].extract_text() or ""
+            yield page_number, text, time.perf_counter() - page_start
+    
+    def _extract_in_children(self, file_path, ranges, timeout):
+        """Extract (start_page, count) ranges in child processes with a hard deadline
+        
+        Pages stream back as they are extracted. At the deadline every child
+        still running is terminated (so a pathological page can't keep burning
+        CPU) and PDFTimeoutError carries the pages received so far.
+        """
+        context = multiprocessing.get_context()
+        out = context.Queue()
+        children = [
+            context.Process(target=_stream_page_range, args=(file_path, start, count, out), daemon=True)
+            for start, count in ranges
+        ]
+        for child in children:
+            child.start()
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pages, error, running = [], None, len(children)
         try:
-            reader = PdfReader(file_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+            while running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                try:
+                    kind, payload = out.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if kind == "page":
+                    pages.append(payload)
+                else:
+                    running -= 1
+                    if kind == "error":
+                        error = error or payload
+        finally:
+            for child in children:
+                if child.is_alive():
+                    child.terminate()
+                child.join()
+        
+        pages.sort()
+        if error:
+            raise RuntimeError(error)
+        if running:
+            raise PDFTimeoutError(f"{file_path}: timed out after {timeout}s", pages)
+        return pages
+    
+    def parse_pdf(self, file_path, max_pages=None, timeout=None, workers=1, parallel_min_pages=16):
+        """Extract text from PDF CV
+        
+        timeout is a hard limit: when set, extraction runs in a child process
+        that is terminated at the deadline, keeping the pages already extracted.
+        Per-page timings and timeout/error details of the last call are kept
+        in self.last_stats.
+        """
+        started = time.perf_counter()
+        self.last_stats = {"file": file_path, "pages": 0, "page_seconds": [],
+                           "seconds": 0.0, "timed_out": False, "error": None}
+        pages = []
+        try:
+            page_count = len(PdfReader(file_path).pages) if workers > 1 else 0
+            if max_pages is not None:
+                page_count = min(page_count, max_pages)
+            if workers > 1 and page_count >= parallel_min_pages:
+                step = max(1, -(-page_count // workers))
+                ranges = [(start, min(step, page_count - start)) for start in range(0, page_count, step)]
+                pages = self._extract_in_children(file_path, ranges, timeout)
+            elif timeout is not None:
+                pages = self._extract_in_children(file_path, [(0, max_pages)], timeout)
+            else:
+                for page in self.iter_pages(file_path, max_pages=max_pages, timeout=timeout):
+                    pages.append(page)
+        except PDFTimeoutError as e:
+            pages = pages or e.pages
+            self.last_stats["timed_out"] = True
+            self.last_stats["error"] = str(e)
+            print(f"⚠ PDF parsing timed out, keeping {len(pages)} pages: {e}")
         except Exception as e:
+            self.last_stats["error"] = str(e)
             print(f"Error parsing PDF: {e}")
-            return ""
+            pages = []
+        
+        self.last_stats["pages"] = len(pages)
+        self.last_stats["page_seconds"] = [seconds for _, _, seconds in pages]
+        self.last_stats["seconds"] = time.perf_counter() - started
+        return "".join(text + "\n" for _, text, _ in pages)
     
     def parse_text(self, file_path):
         """Extract text from TXT CV"""
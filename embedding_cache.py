@@ -0,0 +1,115 @@
+"""
+Embedding Cache - Content-addressed cache for sentence embeddings
+"""
+import hashlib
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import List, Optional
+from pymongo import UpdateOne
+import numpy as np
+
+class EmbeddingCache:
+    def __init__(self, model_name, collection=None, max_entries=20000, ttl_days=None):
+        """In-process LRU backed by an optional MongoDB side collection
+        
+        Disk entries expire ttl_days (default EMBEDDING_CACHE_TTL_DAYS or 30)
+        after they were written, through a TTL index on created_at.
+        """
+        self.model_name = model_name
+        self.collection = collection
+        self.max_entries = max_entries
+        self.ttl_days = ttl_days if ttl_days is not None else float(os.getenv("EMBEDDING_CACHE_TTL_DAYS", "30"))
+        self._ttl_index_ready = False
+        self._lru = OrderedDict()
+        # The LRU is reordered on every read; the store is shared by concurrent sessions
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Canonical form used for hashing (unicode + whitespace)"""
+        return " ".join(unicodedata.normalize("NFC", text).split())
+    
+    def key(self, text: str) -> str:
+        """Cache key for (model name, normalized text)"""
+        payload = f"{self.model_name}\x00{self.normalize(text)}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+    
+    def _remember(self, key, embedding):
+        with self._lock:
+            self._lru[key] = embedding
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+    
+    def get_many(self, keys: List[str], use_disk: bool = True) -> List[Optional[np.ndarray]]:
+        """Look up embeddings by key; None marks a miss
+        
+        use_disk=False only consults the in-process LRU (no Mongo round-trip).
+        """
+        found = [None] * len(keys)
+        pending = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                embedding = self._lru.get(key)
+                if embedding is not None:
+                    self._lru.move_to_end(key)
+                    found[i] = embedding
+                    self.memory_hits += 1
+                else:
+                    pending.setdefault(key, []).append(i)
+        
+        disk_hits = 0
+        if pending and use_disk and self.collection is not None:
+            for doc in self.collection.find({"_id": {"$in": list(pending)}}):
+                embedding = np.frombuffer(doc["embedding"], dtype=np.float32)
+                self._remember(doc["_id"], embedding)
+                for i in pending.pop(doc["_id"]):
+                    found[i] = embedding
+                    disk_hits += 1
+        
+        with self._lock:
+            self.disk_hits += disk_hits
+            self.misses += sum(len(positions) for positions in pending.values())
+        return found
+    
+    def _ensure_ttl_index(self):
+        if not self._ttl_index_ready:
+            self.collection.create_index("created_at", expireAfterSeconds=int(self.ttl_days * 86400))
+            self._ttl_index_ready = True
+    
+    def put_many(self, keys: List[str], embeddings: np.ndarray, persist: bool = True):
+        """Store freshly computed embeddings in memory and, with persist, on disk"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        for key, embedding in zip(keys, embeddings):
+            self._remember(key, embedding)
+        
+        if persist and self.collection is not None and keys:
+            self._ensure_ttl_index()
+            created_at = datetime.now(timezone.utc)
+            self.collection.bulk_write([
+                UpdateOne(
+                    {"_id": key},
+                    {"$setOnInsert": {"model": self.model_name, "embedding": embedding.tobytes(),
+                                      "created_at": created_at}},
+                    upsert=True
+                )
+                for key, embedding in zip(keys, embeddings)
+            ], ordered=False)
+    
+    def stats(self) -> dict:
+        """Hit/miss counters"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(self._lru)
+        }
+
@@ -0,0 +1,81 @@
+"""
+Embedding Codec - Compact BSON binary storage for embeddings
+
+Formats (bytes for a 384-dim vector):
+    float32  1536   lossless
+    float16   768   ~3 significant digits
+    int8      384   per-vector scalar quantization (scale kept alongside)
+    binary     48   sign bits, for Hamming pre-filtering
+
+Documents written before this codec store "embedding" as a list of floats
+and have no "embedding_format"; they still decode.
+"""
+import numpy as np
+
+FORMATS = ("float32", "float16", "int8", "binary")
+
+# Fields a reader needs to decode an embedding (use as a projection)
+PROJECTION = {"embedding": 1, "embedding_format": 1, "embedding_scale": 1, "embedding_dim": 1}
+
+def encode(embedding, fmt="float32"):
+    """Document fields storing one embedding in the given format"""
+    vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+    if fmt == "float32":
+        return {"embedding": vector.tobytes(), "embedding_format": fmt}
+    if fmt == "float16":
+        return {"embedding": vector.astype(np.float16).tobytes(), "embedding_format": fmt}
+    if fmt == "int8":
+        scale = float(np.abs(vector).max()) / 127 or 1.0
+        quantized = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+        return {"embedding": quantized.tobytes(), "embedding_format": fmt, "embedding_scale": scale}
+    if fmt == "binary":
+        return {"embedding": np.packbits(vector > 0).tobytes(), "embedding_format": fmt,
+                "embedding_dim": len(vector)}
+    raise ValueError(f"Unknown embedding format: {fmt}")
+
+def decode(doc, dim=None):
+    """float32 vector of a stored document (binary formats decode to +1/-1 signs)"""
+    fmt = doc.get("embedding_format")
+    raw = doc["embedding"]
+    if fmt is None:
+        return np.asarray(raw, dtype=np.float32)
+    if fmt == "float32":
+        # Zero-copy view over the BSON bytes
+        return np.frombuffer(raw, dtype=np.float32)
+    if fmt == "float16":
+        return np.frombuffer(raw, dtype=np.float16).astype(np.float32)
+    if fmt == "int8":
+        return np.frombuffer(raw, dtype=np.int8).astype(np.float32) * np.float32(doc["embedding_scale"])
+    if fmt == "binary":
+        bits = np.unpackbits(np.frombuffer(raw, dtype=np.uint8), count=dim or doc.get("embedding_dim"))
+        return bits.astype(np.float32) * 2 - 1
+    raise ValueError(f"Unknown embedding format: {fmt}")
+
+def decode_bits(doc):
+    """Packed sign bits of a stored document (computed for non-binary formats)"""
+    if doc.get("embedding_format") == "binary":
+        return np.frombuffer(doc["embedding"], dtype=np.uint8)
+    return np.packbits(decode(doc) > 0)
+
+def decode_many(docs, fmt):
+    """Stack many documents into one matrix for an index of format fmt
+    
+    Returns packed uint8 sign bits for "binary", float32 vectors otherwise.
+    Blobs of a uniform fixed-width format are joined and viewed with a
+    single np.frombuffer instead of being converted one by one.
+    """
+    if not docs:
+        return None
+    if fmt == "binary":
+        return np.vstack([decode_bits(doc) for doc in docs])
+    
+    formats = {doc.get("embedding_format") for doc in docs}
+    if formats == {"float32"}:
+        return np.frombuffer(b"".join(doc["embedding"] for doc in docs), dtype=np.float32).reshape(len(docs), -1)
+    if formats == {"float16"}:
+        return np.frombuffer(b"".join(doc["embedding"] for doc in docs), dtype=np.float16).reshape(len(docs), -1).astype(np.float32)
+    if formats == {"int8"}:
+        matrix = np.frombuffer(b"".join(doc["embedding"] for doc in docs), dtype=np.int8).reshape(len(docs), -1)
+        scales = np.array([doc["embedding_scale"] for doc in docs], dtype=np.float32)
+        return matrix.astype(np.float32) * scales[:, None]
+    return np.vstack([decode(doc) for doc in docs])
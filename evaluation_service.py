@@ -0,0 +1,73 @@
+"""
+Evaluation Service - Score each skill profile once per graph version
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+class EvaluationService:
+    def __init__(self, max_entries=1024):
+        """Memoize evaluations keyed by (graph version, skill-set fingerprint)"""
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def fingerprint(person_skills):
+        """Canonical hash of a skill set (order and duplicates don't matter)"""
+        canonical = "\x00".join(sorted(set(person_skills)))
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+    
+    def _get(self, key):
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return value
+    
+    def _put(self, key, value):
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+    
+    def evaluate(self, snapshot, person_skills):
+        """Evaluation of person_skills against snapshot; returns (evaluation, cached)
+        
+        The returned list is shared between callers and must not be mutated.
+        """
+        key = ("evaluation", snapshot.version, self.fingerprint(person_skills))
+        evaluation = self._get(key)
+        if evaluation is not None:
+            return evaluation, True
+        evaluation = snapshot.evaluate(person_skills)
+        self._put(key, evaluation)
+        return evaluation, False
+    
+    def field_distribution(self, snapshot, person_skills):
+        """Per-field count of the person's skills, derived from the shared evaluation"""
+        key = ("distribution", snapshot.version, self.fingerprint(person_skills))
+        distribution = self._get(key)
+        if distribution is not None:
+            return distribution
+        
+        evaluation, _ = self.evaluate(snapshot, person_skills)
+        counts = {item["field"]: len(item["matched_skills"]) for item in evaluation}
+        distribution = [
+            {"field": field, "skills_count": counts[field]}
+            for field in snapshot.fields
+            if counts.get(field, 0) > 0
+        ]
+        distribution.sort(key=lambda x: x["skills_count"], reverse=True)
+        self._put(key, distribution)
+        return distribution
+    
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache)}
@@ -0,0 +1,93 @@
+"""
+Skill Graph Snapshot - In-process, versioned copy of the Field/Skill taxonomy
+"""
+import hashlib
+import numpy as np
+from skill_matcher import SkillMatcher
+from scoring import FieldScorer
+
+class SkillGraphSnapshot:
+    def __init__(self, fields, skills, edges):
+        """Build integer-ID CSR adjacency from names and (skill, field, level) edges
+        
+        fields/skills keep graph order; edges keep query order, which becomes
+        the order of each field's skill list.
+        """
+        self.fields = list(fields)
+        self.field_ids = {name: i for i, name in enumerate(self.fields)}
+        self.skills = list(skills)
+        self.skill_ids = {name: i for i, name in enumerate(self.skills)}
+        self.version = 0
+        
+        edge_skill = np.array([self.skill_ids[s] for s, _, _ in edges], dtype=np.int32)
+        edge_field = np.array([self.field_ids[f] for _, f, _ in edges], dtype=np.int32)
+        edge_level = np.array([level or "" for _, _, level in edges], dtype=object)
+        
+        # Field -> skills (stable sort keeps the per-field edge order)
+        order = np.argsort(edge_field, kind="stable")
+        self.field_indptr = np.zeros(len(self.fields) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edge_field, minlength=len(self.fields)), out=self.field_indptr[1:])
+        self.field_skills = edge_skill[order]
+        
+        # Skill -> fields, with the relationship level alongside
+        order = np.argsort(edge_skill, kind="stable")
+        self.skill_indptr = np.zeros(len(self.skills) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edge_skill, minlength=len(self.skills)), out=self.skill_indptr[1:])
+        self.skill_fields = edge_field[order]
+        self.skill_levels = edge_level[order]
+        
+        digest = hashlib.sha256()
+        for item in (sorted(self.fields), sorted(self.skills), sorted((s, f, l or "") for s, f, l in edges)):
+            digest.update(repr(item).encode("utf-8"))
+        self.fingerprint = digest.hexdigest()
+        self._matcher = None
+        self._scorer = None
+    
+    @classmethod
+    def load(cls, tx):
+        """Read the whole taxonomy in three queries (run inside a read transaction)"""
+        fields = [r["field"] for r in tx.run("MATCH (f:Field) RETURN f.name as field")]
+        skills = [r["skill"] for r in tx.run("MATCH (s:Skill) RETURN s.name as skill")]
+        edges = [
+            (r["skill"], r["field"], r["level"])
+            for r in tx.run("""
+                MATCH (s:Skill)-[r:REQUIRED_FOR]->(f:Field)
+                RETURN s.name as skill, f.name as field, r.level as level
+            """)
+        ]
+        return cls(fields, skills, edges)
+    
+    @property
+    def edge_count(self):
+        return len(self.field_skills)
+    
+    def skill_matcher(self):
+        """Aho-Corasick matcher over this snapshot's skills, compiled on first use"""
+        if self._matcher is None:
+            self._matcher = SkillMatcher(self.skills)
+        return self._matcher
+    
+    def scorer(self):
+        """Vectorized field scorer over this snapshot, built on first use"""
+        if self._scorer is None:
+            self._scorer = FieldScorer(self.fields, self.skills, self.field_indptr, self.field_skills)
+        return self._scorer
+    
+    def field_skill_names(self, field_id):
+        ids = self.field_skills[self.field_indptr[field_id]:self.field_indptr[field_id + 1]]
+        return [self.skills[i] for i in ids.tolist()]
+    
+    def fields_for_skill(self, skill):
+        """(field, level) pairs the skill is REQUIRED_FOR"""
+        skill_id = self.skill_ids.get(skill)
+        if skill_id is None:
+            return []
+        start, end = self.skill_indptr[skill_id], self.skill_indptr[skill_id + 1]
+        return [
+            (self.fields[f], level)
+            for f, level in zip(self.skill_fields[start:end].tolist(), self.skill_levels[start:end].tolist())
+        ]
+    
+    def evaluate(self, person_skills):
+        """Per-field match scores (same structure as Neo4jSkillsManager.evaluate_skills)"""
+        return self.scorer().evaluate(person_skills)
@@ -1,16 +1,89 @@
 """
 Knowledge Graph Visualizer - Generate graph data for user skills
 """
+import time
+from collections import OrderedDict
 
 class SkillsGraphVisualizer:
-    def __init__(self, neo4j_manager):
+    def __init__(self, neo4j_manager, use_snapshot=True, cache_size=128, cache_ttl=60):
+        """cache_ttl: lifetime (seconds) of payloads built without the snapshot,
+        which have no graph version to be invalidated by"""
         self.neo4j = neo4j_manager
+        self.use_snapshot = use_snapshot
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._payload_cache = OrderedDict()
     
-    def get_person_graph_data(self, person_skills):
-        """Get graph data for visualization of person's skills and field connections"""
+    def _skill_field_edges(self, person_skills):
+        """(skill, field, level) edges for all of the person's skills"""
+        if self.use_snapshot:
+            snapshot = self.neo4j.get_snapshot()
+            return [
+                (skill, field, level)
+                for skill in person_skills
+                for field, level in snapshot.fields_for_skill(skill)
+            ]
+        
+        # One round trip for every skill instead of one query per skill
+        with self.neo4j.driver.session() as session:
+            result = session.run("""
+                UNWIND $skills AS skill_name
+                MATCH (s:Skill {name: skill_name})-[r:REQUIRED_FOR]->(f:Field)
+                RETURN s.name as skill, f.name as field, r.level as level
+            """, skills=list(person_skills))
+            return [(record["skill"], record["field"], record["level"]) for record in result]
+    
+    def get_person_graph_data(self, person_skills, max_nodes=None, min_field_degree=1):
+        """Get graph data for visualization of person's skills and field connections
+        
+        Fields connected to fewer than min_field_degree of the person's skills,
+        and the lowest-degree fields beyond max_nodes, are collapsed into a
+        single "Other fields" node. max_nodes is split between fields and
+        skills; skills that don't fit are counted in an "Other skills" node.
+        Payloads are cached per skill set.
+        """
         if not person_skills:
             return {"nodes": [], "edges": []}
         
+        # Reading graph_version loads the snapshot, so the direct-query path expires by age instead
+        version = self.neo4j.graph_version if self.use_snapshot else None
+        key = (version, tuple(person_skills), max_nodes, min_field_degree)
+        cached = self._payload_cache.get(key)
+        if cached is None or (not self.use_snapshot and time.monotonic() - cached[0] > self.cache_ttl):
+            cached = (time.monotonic(), self._build_graph_data(person_skills, max_nodes, min_field_degree))
+            self._payload_cache[key] = cached
+            while len(self._payload_cache) > self.cache_size:
+                self._payload_cache.popitem(last=False)
+        self._payload_cache.move_to_end(key)
+        return cached[1]
+    
+    def _build_graph_data(self, person_skills, max_nodes, min_field_degree):
+        skills = list(dict.fromkeys(person_skills))
+        
+        fields_by_skill = {}
+        degree = {}
+        for skill, field, level in self._skill_field_edges(skills):
+            fields_by_skill.setdefault(skill, []).append((field, level))
+            degree[field] = degree.get(field, 0) + 1
+        
+        # Highest-degree fields are shown first; the rest are collapsed
+        ranked = sorted((f for f in degree if degree[f] >= min_field_degree), key=lambda f: -degree[f])
+        hidden_skills = []
+        if max_nodes is not None:
+            # Beyond the person and the two "Other" nodes, fields get up to half
+            # of the budget (more if there are few skills) and skills the rest
+            budget = max(max_nodes - 3, 2)
+            ranked = ranked[:max(budget // 2, budget - len(skills))]
+            if len(skills) > budget - len(ranked):
+                # Keep the skills that link to the most shown fields
+                shown = set(ranked)
+                links = {skill: sum(field in shown for field, _ in fields_by_skill.get(skill, [])) for skill in skills}
+                kept = set(sorted(skills, key=lambda skill: -links[skill])[:max(budget - len(ranked), 1)])
+                hidden_skills = [skill for skill in skills if skill not in kept]
+                skills = [skill for skill in skills if skill in kept]
+        shown_fields = set(ranked)
+        collapsed_fields = set(degree) - shown_fields
+        
         nodes = []
         edges = []
         node_ids = set()
@@ -25,85 +98,103 @@ class SkillsGraphVisualizer:
         })
         node_ids.add("user")
         
-        # Query Neo4j for skill connections
-        with self.neo4j.driver.session() as session:
-            for skill in person_skills:
-                skill_id = f"skill_{skill.replace(' ', '_')}"
+        for skill in skills:
+            skill_id = f"skill_{skill.replace(' ', '_')}"
+            
+            if skill_id not in node_ids:
+                # Add skill node
+                nodes.append({
+                    "id": skill_id,
+                    "label": skill,
+                    "type": "skill",
+                    "size": 25,
+                    "color": "#8B5CF6"  # Purple
+                })
+                node_ids.add(skill_id)
                 
-                if skill_id not in node_ids:
-                    # Add skill node
+                # Edge from user to skill
+                edges.append({
+                    "from": "user",
+                    "to": skill_id,
+                    "label": "has",
+                    "color": "#6B7A91"
+                })
+            
+            # Get fields this skill connects to
+            hidden = 0
+            for field, level in fields_by_skill.get(skill, []):
+                if field in collapsed_fields:
+                    hidden += 1
+                    continue
+                field_id = f"field_{field.replace(' ', '_')}"
+                
+                if field_id not in node_ids:
+                    # Add field node
                     nodes.append({
-                        "id": skill_id,
-                        "label": skill,
-                        "type": "skill",
-                        "size": 25,
-                        "color": "#8B5CF6"  # Purple
-                    })
-                    node_ids.add(skill_id)
-                    
-                    # Edge from user to skill
-                    edges.append({
-                        "from": "user",
-                        "to": skill_id,
-                        "label": "has",
-                        "color": "#6B7A91"
+                        "id": field_id,
+                        "label": field,
+                        "type": "field",
+                        "size": 35,
+                        "color": "#10B981"  # Emerald
                     })
+                    node_ids.add(field_id)
                 
-                # Get fields this skill connects to
-                result = session.run("""
-                    MATCH (s:Skill {name: $skill_name})-[r:REQUIRED_FOR]->(f:Field)
-                    RETURN f.name as field, r.level as level
-                """, skill_name=skill)
-                
-                for record in result:
-                    field = record["field"]
-                    field_id = f"field_{field.replace(' ', '_')}"
-                    
-                    if field_id not in node_ids:
-                        # Add field node
-                        nodes.append({
-                            "id": field_id,
-                            "label": field,
-                            "type": "field",
-                            "size": 35,
-                            "color": "#10B981"  # Emerald
-                        })
-                        node_ids.add(field_id)
-                    
-                    # Edge from skill to field
-                    edges.append({
-                        "from": skill_id,
-                        "to": field_id,
-                        "label": record["level"],
-                        "color": "#9CA8B8",
-                        "dashes": True
+                # Edge from skill to field
+                edges.append({
+                    "from": skill_id,
+                    "to": field_id,
+                    "label": level,
+                    "color": "#9CA8B8",
+                    "dashes": True
+                })
+            
+            if hidden:
+                if "field_other" not in node_ids:
+                    nodes.append({
+                        "id": "field_other",
+                        "label": f"Other fields ({len(collapsed_fields)})",
+                        "type": "field",
+                        "size": 20,
+                        "color": "#475569"  # Slate
                     })
+                    node_ids.add("field_other")
+                edges.append({
+                    "from": skill_id,
+                    "to": "field_other",
+                    "label": f"+{hidden}",
+                    "color": "#64748B",
+                    "dashes": True
+                })
+        
+        if hidden_skills:
+            nodes.append({
+                "id": "skill_other",
+                "label": f"Other skills ({len(hidden_skills)})",
+                "type": "skill",
+                "size": 20,
+                "color": "#475569"  # Slate
+            })
+            edges.append({
+                "from": "user",
+                "to": "skill_other",
+                "label": "has",
+                "color": "#64748B",
+                "dashes": True
+            })
         
         return {"nodes": nodes, "edges": edges}
     
     def get_field_distribution(self, person_skills):
         """Get skill distribution across fields"""
-        distribution = []
+        if self.use_snapshot:
+            return self.neo4j.get_field_distribution(person_skills)
         
+        # Single grouped query instead of one count query per field
         with self.neo4j.driver.session() as session:
-            # Get all fields
-            fields_result = session.run("MATCH (f:Field) RETURN f.name as field")
-            fields = [r["field"] for r in fields_result]
-            
-            for field in fields:
-                # Count skills for this field
-                result = session.run("""
-                    MATCH (s:Skill)-[:REQUIRED_FOR]->(f:Field {name: $field_name})
-                    WHERE s.name IN $person_skills
-                    RETURN count(s) as count
-                """, field_name=field, person_skills=person_skills)
-                
-                count = result.single()["count"]
-                if count > 0:
-                    distribution.append({
-                        "field": field,
-                        "skills_count": count
-                    })
-        
-        distribution.sort(key=lambda x: x["skills_count"], reverse=True)
-        return distribution
+            result = session.run("""
+                MATCH (s:Skill)-[:REQUIRED_FOR]->(f:Field)
+                WHERE s.name IN $person_skills
+                RETURN f.name as field, count(s) as skills_count
+                ORDER BY skills_count DESC
+            """, person_skills=list(person_skills))
+            return [{"field": r["field"], "skills_count": r["skills_count"]} for r in result]
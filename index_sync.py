@@ -0,0 +1,146 @@
+"""
+Index Sync - Keep in-process indexes in step with a shared MongoDB collection
+
+Every write reserves a range of sequence numbers from a counter document
+and stamps each document with its `seq`; `clear` bumps an `epoch`. A process
+compares the counter with what it has applied and fetches only the newer
+documents. When the server supports change streams (replica set / Atlas) a
+watcher thread marks the state dirty so checks are immediate; on a
+standalone mongod the counter is polled instead.
+
+Works with any pymongo-compatible collection (including mongomock).
+"""
+import threading
+import time
+from pymongo import ReturnDocument
+
+class IndexSync:
+    def __init__(self, collection, meta_collection, key=None, poll_interval=2.0, gap_timeout=30.0):
+        """collection: the synced documents; meta_collection holds the counter document"""
+        self.collection = collection
+        self.meta = meta_collection
+        self.key = key or collection.name
+        self.poll_interval = poll_interval
+        self.gap_timeout = gap_timeout
+        self.epoch = None
+        self.synced_seq = 0
+        self._gap_since = None
+        self._checked_at = 0.0
+        self._dirty = threading.Event()
+        self._watcher = None
+        self._seq_index_ready = False
+    
+    # ---- Writers ------------------------------------------------------------
+    
+    def reserve(self, count):
+        """Reserve `count` consecutive sequence numbers; returns the first one"""
+        counter = self.meta.find_one_and_update(
+            {"_id": self.key},
+            {"$inc": {"seq": count}, "$setOnInsert": {"epoch": 0}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return counter["seq"] - count + 1
+    
+    def bump_epoch(self):
+        """Tell every process that the collection was reset"""
+        self.meta.update_one({"_id": self.key}, {"$inc": {"epoch": 1}}, upsert=True)
+    
+    # ---- Readers ------------------------------------------------------------
+    
+    def state(self):
+        """(epoch, seq) of the shared counter"""
+        counter = self.meta.find_one({"_id": self.key}) or {}
+        return counter.get("epoch", 0), counter.get("seq", 0)
+    
+    def mark_loaded(self, epoch, seq):
+        """Record the counter state read just before a full load"""
+        self.epoch = epoch
+        self.synced_seq = seq
+        self._gap_since = None
+    
+    def due(self):
+        """Whether a check is needed (change event seen, or poll interval elapsed)"""
+        if self._dirty.is_set():
+            return True
+        # With a live change stream, polling is only a slow safety net
+        interval = self.poll_interval * 30 if self.watching else self.poll_interval
+        return time.monotonic() - self._checked_at >= interval
+    
+    def pending(self, known_ids):
+        """Documents written by other processes since the last sync
+        
+        Returns (reset, new_ids): reset means the epoch changed and the caller
+        must reload everything; new_ids are unknown documents with a newer seq.
+        """
+        self._dirty.clear()
+        self._checked_at = time.monotonic()
+        epoch, seq = self.state()
+        if epoch != self.epoch:
+            return True, []
+        if seq <= self.synced_seq:
+            return False, []
+        
+        if not self._seq_index_ready:
+            self.collection.create_index("seq")
+            self._seq_index_ready = True
+        stamps = sorted(
+            (doc["seq"], doc["_id"])
+            for doc in self.collection.find({"seq": {"$gt": self.synced_seq}}, {"seq": 1})
+        )
+        self._advance([s for s, _ in stamps], seq)
+        return False, [doc_id for _, doc_id in stamps if doc_id not in known_ids]
+    
+    def _advance(self, seqs, counter_seq):
+        """Move synced_seq over the contiguous run of seen sequence numbers
+        
+        A hole means a writer reserved numbers but hasn't inserted yet (or
+        failed); it is waited for up to gap_timeout seconds, then skipped.
+        """
+        expected = self.synced_seq + 1
+        for s in seqs:
+            if s != expected:
+                break
+            expected += 1
+        contiguous = expected - 1
+        if contiguous >= counter_seq:
+            self.synced_seq = counter_seq
+            self._gap_since = None
+            return
+        now = time.monotonic()
+        if self._gap_since is None:
+            self._gap_since = now
+        if now - self._gap_since > self.gap_timeout:
+            self.synced_seq = max(seqs[-1] if seqs else contiguous, contiguous)
+            self._gap_since = None
+        else:
+            self.synced_seq = contiguous
+    
+    # ---- Change streams -----------------------------------------------------
+    
+    @property
+    def watching(self):
+        return self._watcher is not None and self._watcher.is_alive()
+    
+    def start_watching(self):
+        """Tail a change stream in the background; returns False when unsupported"""
+        if self.watching:
+            return True
+        try:
+            stream = self.collection.watch([{"$match": {"operationType": {"$in": ["insert", "delete", "drop", "invalidate"]}}}])
+        except Exception as e:
+            print(f"⚠ Change streams unavailable ({e}); polling every {self.poll_interval}s")
+            return False
+        
+        def tail():
+            try:
+                with stream:
+                    for _ in stream:
+                        self._dirty.set()
+            except Exception as e:
+                print(f"⚠ Change stream closed ({e}); falling back to polling")
+            self._dirty.set()
+        
+        self._watcher = threading.Thread(target=tail, name=f"watch-{self.key}", daemon=True)
+        self._watcher.start()
+        return True
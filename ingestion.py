@@ -0,0 +1,224 @@
+"""
+Document Ingestion - Stream files into the vector store as overlapping chunks
+
+Usage:
+    python ingestion.py ./docs --max-tokens 256 --overlap 32
+"""
+import argparse
+import hashlib
+import os
+import queue
+import re
+import threading
+import time
+from cv_parser import CVParser
+from embedding_cache import EmbeddingCache
+
+DOC_EXTENSIONS = (".pdf", ".txt", ".md")
+
+_DONE = object()
+_WORD = re.compile(r"\S+")
+
+def iter_paths(inputs):
+    """Files under the given files/directories, in a stable order"""
+    for root in inputs:
+        if os.path.isfile(root):
+            yield root
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.lower().endswith(DOC_EXTENSIONS):
+                    yield os.path.join(dirpath, filename)
+
+def iter_segments(path, block_chars=20000):
+    """Lazily yield (text, page) pieces of a file: one per PDF page, paragraph blocks for text"""
+    if path.lower().endswith(".pdf"):
+        for page_number, text, _ in CVParser().iter_pages(path):
+            if text.strip():
+                yield text, page_number + 1
+        return
+    
+    block = []
+    size = 0
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            block.append(line)
+            size += len(line)
+            # Cut blocks at paragraph breaks so chunks rarely straddle them
+            if size >= block_chars and not line.strip():
+                yield "".join(block), None
+                block, size = [], 0
+    if block:
+        yield "".join(block), None
+
+class TokenChunker:
+    def __init__(self, tokenizer=None, max_tokens=254, overlap=32):
+        """Split text into windows of at most max_tokens tokens, overlapping by `overlap`
+        
+        Uses the embedding model's (fast) tokenizer for character offsets and
+        falls back to whitespace words when it can't provide them.
+        """
+        if overlap >= max_tokens:
+            raise ValueError("overlap must be smaller than max_tokens")
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.overlap = overlap
+    
+    def _offsets(self, text):
+        if self.tokenizer is not None and getattr(self.tokenizer, "is_fast", False):
+            encoded = self.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True,
+                                     truncation=False, verbose=False)
+            return encoded["offset_mapping"]
+        return [m.span() for m in _WORD.finditer(text)]
+    
+    def split(self, text):
+        """Chunk strings of text, each within the token budget"""
+        offsets = self._offsets(text)
+        step = self.max_tokens - self.overlap
+        chunks = []
+        for start in range(0, len(offsets), step):
+            window = offsets[start:start + self.max_tokens]
+            chunk = text[window[0][0]:window[-1][1]].strip()
+            if chunk:
+                chunks.append(chunk)
+            if start + self.max_tokens >= len(offsets):
+                break
+        return chunks
+
+class IngestionPipeline:
+    def __init__(self, vector_store, max_tokens=None, overlap=32, batch_size=128, queue_size=4):
+        """Parse -> chunk/dedup/encode -> write, each stage on its own thread
+        
+        Stages hand work over through bounded queues, so parsing, encoding
+        and Mongo writes overlap while memory stays at a few batches.
+        """
+        model = vector_store.model
+        if max_tokens is None:
+            # Leave room for the [CLS]/[SEP] tokens the model adds
+            max_tokens = getattr(model, "max_seq_length", 256) - 2
+        self.vector_store = vector_store
+        self.chunker = TokenChunker(getattr(model, "tokenizer", None), max_tokens, overlap)
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+    
+    @staticmethod
+    def content_hash(text):
+        return hashlib.sha256(EmbeddingCache.normalize(text).encode("utf-8")).hexdigest()
+    
+    def _parse(self, paths, out, stats):
+        """Stage 1: read files lazily and emit batches of chunk documents"""
+        batch = []
+        for path in iter_paths(paths):
+            stats["files"] += 1
+            chunk_index = 0
+            try:
+                for text, page in iter_segments(path):
+                    for chunk in self.chunker.split(text):
+                        metadata = {"chunk": chunk_index}
+                        if page is not None:
+                            metadata["page"] = page
+                        batch.append({"text": chunk, "source": path, "metadata": metadata,
+                                      "content_hash": self.content_hash(chunk)})
+                        chunk_index += 1
+                        if len(batch) >= self.batch_size:
+                            out.put(batch)
+                            batch = []
+            except Exception as e:
+                stats["errors"] += 1
+                print(f"⚠ Skipping {path}: {e}")
+            stats["chunks"] += chunk_index
+        if batch:
+            out.put(batch)
+    
+    def _encode(self, inbox, out, stats, seen):
+        """Stage 2: drop duplicate chunks (this run and already stored), then embed"""
+        while True:
+            batch = inbox.get()
+            if batch is _DONE:
+                return
+            fresh = []
+            for doc in batch:
+                if doc["content_hash"] not in seen:
+                    seen.add(doc["content_hash"])
+                    fresh.append(doc)
+            stored = self.vector_store.existing_hashes([doc["content_hash"] for doc in fresh])
+            fresh = [doc for doc in fresh if doc["content_hash"] not in stored]
+            stats["duplicates"] += len(batch) - len(fresh)
+            if fresh:
+                out.put((fresh, self.vector_store.encode_texts([doc["text"] for doc in fresh])))
+    
+    @staticmethod
+    def _drain(inbox):
+        """Consume a queue up to its end marker so an upstream stage never blocks"""
+        while inbox.get() is not _DONE:
+            pass
+    
+    def _stage(self, target, args, inbox, out, errors):
+        """Run a stage, always passing the end marker on (even after a failure)"""
+        try:
+            target(*args)
+        except BaseException as e:
+            errors.append(e)
+            if inbox is not None:
+                self._drain(inbox)
+        finally:
+            out.put(_DONE)
+    
+    def run(self, paths):
+        """Ingest every document under paths; returns throughput stats"""
+        start = time.perf_counter()
+        stats = {"files": 0, "chunks": 0, "duplicates": 0, "written": 0, "errors": 0}
+        chunks = queue.Queue(maxsize=self.queue_size)
+        encoded = queue.Queue(maxsize=self.queue_size)
+        errors = []
+        
+        threads = [
+            threading.Thread(target=self._stage, args=(self._parse, (paths, chunks, stats), None, chunks, errors),
+                             name="ingest-parse", daemon=True),
+            threading.Thread(target=self._stage, args=(self._encode, (chunks, encoded, stats, set()), chunks, encoded, errors),
+                             name="ingest-encode", daemon=True)
+        ]
+        for thread in threads:
+            thread.start()
+        
+        # Stage 3 (this thread): bulk writes
+        try:
+            while True:
+                item = encoded.get()
+                if item is _DONE:
+                    break
+                documents, embeddings = item
+                self.vector_store.write_encoded_batch(documents, embeddings)
+                stats["written"] += len(documents)
+        except BaseException as e:
+            errors.append(e)
+            self._drain(encoded)
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        
+        stats["seconds"] = time.perf_counter() - start
+        stats["chunks_per_sec"] = stats["chunks"] / stats["seconds"] if stats["seconds"] > 0 else 0.0
+        print(f"✓ Ingested {stats['files']} files: {stats['chunks']} chunks, "
+              f"{stats['duplicates']} duplicates skipped, {stats['written']} written "
+              f"({stats['chunks_per_sec']:.1f} chunks/sec)")
+        return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest documents into the vector store")
+    parser.add_argument("inputs", nargs="+", help="files or directories (PDF/TXT/MD)")
+    parser.add_argument("--max-tokens", type=int, default=None, help="tokens per chunk (default: model limit)")
+    parser.add_argument("--overlap", type=int, default=32, help="tokens shared by consecutive chunks")
+    parser.add_argument("--batch-size", type=int, default=128, help="chunks per encode/write batch")
+    parser.add_argument("--queue-size", type=int, default=4, help="batches buffered between stages")
+    args = parser.parse_args()
+    
+    from vector_store import VectorStore
+    pipeline = IngestionPipeline(VectorStore(), max_tokens=args.max_tokens, overlap=args.overlap,
+                                 batch_size=args.batch_size, queue_size=args.queue_size)
+    pipeline.run(args.inputs)
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,24 @@
 """
 Modern Skills Intelligence Platform with Knowledge Graph
+
+Heavy dependencies (SentenceTransformer, LangChain/Groq, pandas) and the
+database connections are deferred until first use so the landing page
+renders immediately; the embedding model warms up in the background.
 """
+import time
+_render_start = time.perf_counter()
+
 import streamlit as st
 import os
 import json
-from neo4j_skills_manager import neo4j_skills
-from cv_parser import CVParser
-from rag_pipeline import RAGPipeline
-from graph_visualizer import SkillsGraphVisualizer
-import pandas as pd
-import streamlit.components.v1 as components
+from startup import startup
+
+with startup.timed("import app modules"):
+    from neo4j_skills_manager import neo4j_skills
+    from cv_parser import CVParser, make_person_id
+    from resources import resources
+    from graph_visualizer import SkillsGraphVisualizer
+    import streamlit.components.v1 as components
 
 # Page config
 st.set_page_config(
@@ -318,9 +327,36 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Load the embedding model and taxonomy snapshot off the render path (once per process)
+startup.warm("embedding model", resources.embedding_model)
+startup.warm("skills snapshot", neo4j_skills.get_snapshot)
+
+# Process-wide resources shared by every session (one model and index per server)
+@st.cache_resource
+def get_vector_store():
+    from vector_store import VectorStore
+    with startup.timed("init vector store"):
+        return VectorStore()
+
+@st.cache_resource
+def get_answer_cache():
+    from rag_pipeline import RAGPipeline
+    return RAGPipeline.create_answer_cache()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_health():
+    return resources.health()
+
+def get_rag_pipeline():
+    """Per-session pipeline, created the first time the advisor is used"""
+    if 'rag_pipeline' not in st.session_state:
+        from rag_pipeline import RAGPipeline
+        with startup.timed("init RAG pipeline"):
+            st.session_state.rag_pipeline = RAGPipeline(use_groq=True, neo4j_manager=neo4j_skills, vector_store=get_vector_store(),
+                                                       answer_cache=get_answer_cache())
+    return st.session_state.rag_pipeline
+
 # Initialize session state
-if 'rag_pipeline' not in st.session_state:
-    st.session_state.rag_pipeline = RAGPipeline(use_groq=True, neo4j_manager=neo4j_skills)
 if 'messages' not in st.session_state:
     st.session_state.messages = []
 if 'cv_skills' not in st.session_state:
@@ -340,19 +376,10 @@ with st.sidebar:
     
     st.markdown("## LIBRARY")
     
-    # Stats at top
+    # Stats at top; filled in at the end of the script so database round-trips don't delay the first paint
     col1, col2 = st.columns(2)
-    try:
-        stats = neo4j_skills.get_graph_stats()
-        with col1:
-            st.metric("SKILLS", stats.get("skills", 0), delta="+18%" if stats.get("skills", 0) > 0 else None)
-        with col2:
-            st.metric("FIELDS", stats.get("fields", 0))
-    except:
-        with col1:
-            st.metric("SKILLS", 0)
-        with col2:
-            st.metric("FIELDS", 0)
+    stats_placeholders = (col1.empty(), col2.empty())
+    health_placeholder = st.empty()
     
     st.divider()
     
@@ -387,7 +414,7 @@ with st.sidebar:
                     found_skills = neo4j_skills.extract_cv_skills(cv_text)
                     if found_skills:
                         summary = parser.get_cv_summary(cv_text)
-                        person_id = f"person_{hash(summary['name'])}"
+                        person_id = make_person_id(file_path)
                         neo4j_skills.create_person_profile(person_id, summary['name'], found_skills)
                         
                         st.session_state.cv_skills = found_skills
@@ -399,6 +426,9 @@ with st.sidebar:
 
 # Main content area - 3 column layout
 if st.session_state.evaluation:
+    # One distribution per render, shared by the table and the sidebar bars
+    distribution = st.session_state.graph_visualizer.get_field_distribution(st.session_state.cv_skills)
+    
     col_main, col_insights = st.columns([2, 1])
     
     with col_main:
@@ -458,7 +488,7 @@ if st.session_state.evaluation:
         
         with graph_tab1:
             # Generate graph data
-            graph_data = st.session_state.graph_visualizer.get_person_graph_data(st.session_state.cv_skills)
+            graph_data = st.session_state.graph_visualizer.get_person_graph_data(st.session_state.cv_skills, max_nodes=80)
             
             # Create vis.js network visualization
             html_content = f"""
@@ -528,9 +558,8 @@ if st.session_state.evaluation:
         
         with graph_tab2:
             # Skill distribution table
-            distribution = st.session_state.graph_visualizer.get_field_distribution(st.session_state.cv_skills)
-            
             if distribution:
+                import pandas as pd
                 df = pd.DataFrame(distribution)
                 df.columns = ["Field", "Your Skills Count"]
                 st.dataframe(df, use_container_width=True, hide_index=True)
@@ -560,13 +589,16 @@ if st.session_state.evaluation:
         
         st.metric("MATCH SCORE", f"{top['score']:.1f}%", delta=f"+{top['score']-50:.1f}%")
         
+        # Only report on a pipeline that already exists; building one here would load the model and index
+        if 'rag_pipeline' in st.session_state:
+            cache_stats = st.session_state.rag_pipeline.answer_cache.stats()
+            st.caption(f"Answer cache: {cache_stats['hit_rate']:.0%} hit rate • {cache_stats['entries']} entries")
+        
         st.divider()
         
         # Skill distribution visualization
         st.markdown("### SKILL DISTRIBUTION")
         
-        distribution = st.session_state.graph_visualizer.get_field_distribution(st.session_state.cv_skills)
-        
         if distribution:
             for item in distribution[:5]:
                 st.markdown(f"**{item['field']}**")
@@ -618,11 +650,19 @@ if st.session_state.evaluation:
     if question := st.chat_input("Ask anything about your career..."):
         st.session_state.messages.append({"role": "user", "content": question})
         
-        with st.spinner("Analyzing..."):
-            response = st.session_state.rag_pipeline.query_with_skills(question, st.session_state.cv_skills)
+        # Render the new turn under the advisor history and stream the answer into it
+        with col_main:
+            with st.chat_message("user"):
+                st.markdown(question)
+            with st.chat_message("assistant"):
+                placeholder = st.empty()
+                answer = ""
+                for token in get_rag_pipeline().stream_query_with_skills(question, st.session_state.cv_skills):
+                    answer += token
+                    placeholder.markdown(answer + "▌")
+                placeholder.markdown(answer)
         
-        st.session_state.messages.append({"role": "assistant", "content": response["answer"]})
-        st.rerun()
+        st.session_state.messages.append({"role": "assistant", "content": answer})
 
 else:
     # Welcome screen with logo
@@ -762,3 +802,23 @@ else:
             <p style="color: #94A3B8; font-size: 14px; line-height: 1.7; font-weight: 500;">Instant skill gap analysis with actionable recommendations for career advancement</p>
         </div>
         """, unsafe_allow_html=True)
+
+# Deferred sidebar content (rendered into the placeholders created above)
+try:
+    stats = neo4j_skills.get_graph_stats()
+    stats_placeholders[0].metric("SKILLS", stats.get("skills", 0), delta="+18%" if stats.get("skills", 0) > 0 else None)
+    stats_placeholders[1].metric("FIELDS", stats.get("fields", 0))
+except:
+    stats_placeholders[0].metric("SKILLS", 0)
+    stats_placeholders[1].metric("FIELDS", 0)
+
+health = get_health()
+health_placeholder.caption(" · ".join(
+    f"🟢 {name} {check['latency_ms']:.0f}ms" if check["ok"] else f"🔴 {name} down"
+    for name, check in health.items()
+))
+
+startup.record("first render", time.perf_counter() - _render_start)
+with st.sidebar.expander("Startup timings"):
+    st.caption(f"Embedding model: {'ready' if startup.is_warm('embedding model') else 'warming up…'}")
+    st.json(startup.report())
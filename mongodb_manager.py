@@ -2,8 +2,8 @@
 MongoDB Connection Manager
 """
 import os
-from pymongo import MongoClient
 from dotenv import load_dotenv
+from resources import resources
 
 load_dotenv()
 
@@ -14,10 +14,9 @@ class MongoDB:
         
     def connect(self):
         """Connect to MongoDB"""
-        mongodb_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
         mongodb_db = os.getenv("MONGODB_DB", "rag_db")
         
-        self.client = MongoClient(mongodb_uri)
+        self.client = resources.mongo_client()
         self.db = self.client[mongodb_db]
         print(f"✓ Connected to MongoDB: {mongodb_db}")
         return self.db
@@ -31,7 +30,9 @@ class MongoDB:
     def close(self):
         """Close connection"""
         if self.client:
-            self.client.close()
+            resources.close_mongo()
+            self.client = None
+            self.db = None
             print("✓ MongoDB connection closed")
 
 # Global instance
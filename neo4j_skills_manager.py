@@ -2,36 +2,75 @@
 Neo4j Skills Knowledge Graph Manager
 """
 import os
-from neo4j import GraphDatabase
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
+from graph_snapshot import SkillGraphSnapshot
+from evaluation_service import EvaluationService
+from similarity_index import MinHashLSHIndex
+from resources import resources
 import json
 
 load_dotenv()
 
 class Neo4jSkillsManager:
     def __init__(self):
-        """Initialize Neo4j connection"""
-        uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-        username = os.getenv("NEO4J_USERNAME", "neo4j")
-        password = os.getenv("NEO4J_PASSWORD", "password")
+        """Set up caches; the Neo4j connection is opened lazily on first use"""
+        self._driver = None
+        self._driver_lock = threading.Lock()
         
-        try:
-            self.driver = GraphDatabase.driver(uri, auth=(username, password))
-            self.driver.verify_connectivity()
-            print("✓ Connected to Neo4j")
-            self._create_constraints()
-        except Exception as e:
-            print(f"⚠ Neo4j connection failed: {e}")
-            self.driver = None
-    
-    def _create_constraints(self):
+        # In-process snapshot of the Field/Skill taxonomy, shared by all read paths
+        self.snapshot_ttl = float(os.getenv("SKILLS_SNAPSHOT_TTL", "300"))
+        self._snapshot = None
+        self._snapshot_loaded_at = 0.0
+        self._graph_version = 0
+        self._person_stats = None
+        self._snapshot_lock = threading.Lock()
+        self.evaluation_service = EvaluationService()
+        
+        # MinHash/LSH index over Person skill sets, built on first use and
+        # updated as profiles are written. Profiles written by other processes
+        # are folded in by an incremental refresh (Persons whose updated_at is
+        # past the watermark); a full rebuild only runs every PROFILE_INDEX_REBUILD s.
+        self.profile_refresh_interval = float(os.getenv("PROFILE_INDEX_REFRESH", "30"))
+        self.profile_rebuild_interval = float(os.getenv("PROFILE_INDEX_REBUILD", "3600"))
+        self._profile_index = None
+        self._profile_index_built_at = 0.0
+        self._profile_index_checked_at = 0.0
+        self._profile_watermark = 0
+        self._profile_index_lock = threading.Lock()
+        self._profile_refresh_lock = threading.Lock()
+    
+    @property
+    def driver(self):
+        """Shared Neo4j driver; connects and creates constraints on first access
+        
+        Returns None while Neo4j is unreachable. Reconnects are attempted only
+        after the resource manager's cooldown (NEO4J_RETRY_COOLDOWN), so an
+        outage doesn't put a connectivity check (and its timeout) on every access.
+        """
+        if self._driver is None and not resources.neo4j_retry_in():
+            with self._driver_lock:
+                if self._driver is None and not resources.neo4j_retry_in():
+                    try:
+                        driver = resources.neo4j_driver()
+                        print("✓ Connected to Neo4j")
+                        self._create_constraints(driver)
+                        self._driver = driver
+                    except Exception as e:
+                        print(f"⚠ Neo4j connection failed: {e} (retrying in {resources.neo4j_retry_in():.0f}s)")
+        return self._driver
+    
+    def _create_constraints(self, driver):
         """Create constraints and indexes"""
-        with self.driver.session() as session:
+        with driver.session() as session:
             # Create constraints
             queries = [
                 "CREATE CONSTRAINT skill_name IF NOT EXISTS FOR (s:Skill) REQUIRE s.name IS UNIQUE",
                 "CREATE CONSTRAINT field_name IF NOT EXISTS FOR (f:Field) REQUIRE f.name IS UNIQUE",
-                "CREATE CONSTRAINT person_name IF NOT EXISTS FOR (p:Person) REQUIRE p.id IS UNIQUE"
+                "CREATE CONSTRAINT person_name IF NOT EXISTS FOR (p:Person) REQUIRE p.id IS UNIQUE",
+                "CREATE INDEX person_updated_at IF NOT EXISTS FOR (p:Person) ON (p.updated_at)"
             ]
             for query in queries:
                 try:
@@ -39,7 +78,67 @@ class Neo4jSkillsManager:
                 except:
                     pass
     
-    def load_skills_dataset(self, dataset):
+    @staticmethod
+    def _run_unwind(tx, query, rows):
+        """Run one UNWIND batch inside a managed write transaction"""
+        tx.run(query, rows=rows).consume()
+    
+    @staticmethod
+    def _batches(rows, batch_size):
+        for i in range(0, len(rows), batch_size):
+            yield rows[i:i + batch_size]
+    
+    @staticmethod
+    def _field_partitioned_batches(edges, batch_size):
+        """Pack whole fields into batches so parallel writers rarely touch the same Field node"""
+        by_field = {}
+        for edge in edges:
+            by_field.setdefault(edge["field"], []).append(edge)
+        
+        batch = []
+        for field_edges in by_field.values():
+            if batch and len(batch) + len(field_edges) > batch_size:
+                yield batch
+                batch = []
+            for chunk in Neo4jSkillsManager._batches(field_edges, batch_size):
+                if len(chunk) == batch_size:
+                    yield chunk
+                else:
+                    batch.extend(chunk)
+        if batch:
+            yield batch
+    
+    def _write_batches(self, label, query, batches, total, workers=1):
+        """Write UNWIND batches (optionally in parallel) and report throughput"""
+        start = time.perf_counter()
+        written = 0
+        
+        def write(rows):
+            with self.driver.session() as session:
+                session.execute_write(self._run_unwind, query, rows)
+            return len(rows)
+        
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                done = (future.result() for future in as_completed(
+                    [executor.submit(write, rows) for rows in batches]))
+                for count in done:
+                    written += count
+                    self._report_progress(label, written, total, start)
+        else:
+            for rows in batches:
+                written += write(rows)
+                self._report_progress(label, written, total, start)
+        
+        return written
+    
+    @staticmethod
+    def _report_progress(label, written, total, start):
+        elapsed = time.perf_counter() - start
+        rate = written / elapsed if elapsed > 0 else 0.0
+        print(f"  ↳ {label}: {written}/{total} ({rate:.0f} rows/sec)")
+    
+    def load_skills_dataset(self, dataset, batch_size=1000, workers=1):
         """Load skills dataset into Neo4j
         Expected format: [
             {
@@ -48,132 +147,176 @@ class Neo4jSkillsManager:
                 "level": "Intermediate"
             }
         ]
+        
+        Rows are sent as batched UNWIND parameters in explicit write
+        transactions; workers > 1 writes relationship batches in parallel,
+        partitioned by field.
         """
         print(f"📊 Loading {len(dataset)} fields into Neo4j...")
+        start = time.perf_counter()
+        
+        fields = {}
+        skills = {}
+        edges = []
+        for item in dataset:
+            field_name = item.get("field", "Unknown")
+            level = item.get("level", "Entry")
+            fields[field_name] = {"name": field_name, "description": item.get("description", "")}
+            for skill in item.get("skills", []):
+                skills[skill] = {"name": skill}
+                edges.append({"skill": skill, "field": field_name, "level": level})
+        
+        # Create Field and Skill nodes first so relationship batches only MATCH them
+        self._write_batches("Fields", """
+            UNWIND $rows AS row
+            MERGE (f:Field {name: row.name})
+            SET f.description = row.description
+        """, self._batches(list(fields.values()), batch_size), len(fields))
+        
+        self._write_batches("Skills", """
+            UNWIND $rows AS row
+            MERGE (s:Skill {name: row.name})
+        """, self._batches(list(skills.values()), batch_size), len(skills))
+        
+        self._write_batches("REQUIRED_FOR", """
+            UNWIND $rows AS row
+            MATCH (s:Skill {name: row.skill})
+            MATCH (f:Field {name: row.field})
+            MERGE (s)-[r:REQUIRED_FOR]->(f)
+            SET r.level = row.level
+        """, self._field_partitioned_batches(edges, batch_size), len(edges), workers=workers)
+        
+        elapsed = time.perf_counter() - start
+        rate = len(edges) / elapsed if elapsed > 0 else 0.0
+        print(f"✓ Neo4j: Loaded {len(dataset)} field-skill mappings with relationships "
+              f"in {elapsed:.2f}s ({rate:.0f} edges/sec)")
         
         with self.driver.session() as session:
-            for item in dataset:
-                field_name = item.get("field", "Unknown")
-                skills = item.get("skills", [])
-                level = item.get("level", "Entry")
-                
-                print(f"  ↳ Creating Field: {field_name} with {len(skills)} skills")
-                
-                # Create Field node
-                session.run("""
-                    MERGE (f:Field {name: $field_name})
-                    SET f.description = $description
-                """, field_name=field_name, description=item.get("description", ""))
-                
-                # Create Skill nodes and relationships
-                for skill in skills:
-                    session.run("""
-                        MERGE (s:Skill {name: $skill_name})
-                        MERGE (f:Field {name: $field_name})
-                        MERGE (s)-[r:REQUIRED_FOR]->(f)
-                        SET r.level = $level
-                    """, skill_name=skill, field_name=field_name, level=level)
-            
-            print(f"✓ Neo4j: Loaded {len(dataset)} field-skill mappings with relationships")
-            
             # Verify what was created
             result = session.run("MATCH (s:Skill)-[r:REQUIRED_FOR]->(f:Field) RETURN count(r) as total")
             total_rels = result.single()["total"]
             print(f"✓ Neo4j: Created {total_rels} REQUIRED_FOR relationships in graph")
+        
+        self.invalidate_snapshot()
+    
+    def invalidate_snapshot(self):
+        """Force the next read to reload the taxonomy snapshot"""
+        with self._snapshot_lock:
+            self._snapshot_loaded_at = 0.0
+            self._person_stats = None
+    
+    def get_snapshot(self):
+        """Current taxonomy snapshot, reloaded when invalidated or older than the TTL"""
+        with self._snapshot_lock:
+            age = time.monotonic() - self._snapshot_loaded_at
+            if self._snapshot is None or self._snapshot_loaded_at == 0.0 or age > self.snapshot_ttl:
+                with self.driver.session() as session:
+                    snapshot = session.execute_read(SkillGraphSnapshot.load)
+                self._person_stats = None
+                
+                # Keep the old object (and its compiled matcher) if nothing changed
+                if self._snapshot is None or snapshot.fingerprint != self._snapshot.fingerprint:
+                    self._graph_version += 1
+                    snapshot.version = self._graph_version
+                    self._snapshot = snapshot
+                    print(f"✓ Neo4j: Snapshot v{snapshot.version} with {len(snapshot.fields)} fields, "
+                          f"{len(snapshot.skills)} skills, {snapshot.edge_count} links")
+                self._snapshot_loaded_at = time.monotonic()
+            return self._snapshot
+    
+    @property
+    def graph_version(self):
+        """Monotonic stamp that changes whenever the taxonomy content changes"""
+        return self.get_snapshot().version
+    
+    def extract_cv_skill_matches(self, cv_text):
+        """Skill occurrences in the CV with character offsets, for highlighting"""
+        return self.get_snapshot().skill_matcher().find_all(cv_text)
     
     def extract_cv_skills(self, cv_text):
         """Extract skills from CV by matching against known skills in graph"""
+        return self.get_snapshot().skill_matcher().find_skills(cv_text)
+    
+    _UPSERT_PROFILES = """
+        UNWIND $rows AS row
+        MERGE (p:Person {id: row.id})
+        SET p.name = row.name, p.updated_at = timestamp()
+        WITH p, row
+        UNWIND row.skills AS skill_name
+        MERGE (s:Skill {name: skill_name})
+        MERGE (p)-[:HAS_SKILL]->(s)
+    """
+    
+    @staticmethod
+    def _profile_row(person_id, name, skills):
+        """Deduplicated, sorted skills so concurrent writers lock Skill nodes in the same order"""
+        return {"id": person_id, "name": name, "skills": sorted(set(skills))}
+    
+    def _upsert_profiles(self, rows):
+        """Write profile rows in one managed transaction
+        
+        execute_write retries transient failures (deadlocks, leader changes)
+        with backoff for up to NEO4J_MAX_RETRY_TIME seconds.
+        """
         with self.driver.session() as session:
-            # Get all skills from graph
-            result = session.run("MATCH (s:Skill) RETURN s.name as skill")
-            known_skills = [record["skill"].lower() for record in result]
-            
-            # Simple matching - check if skill appears in CV
-            cv_lower = cv_text.lower()
-            found_skills = []
-            
-            for skill in known_skills:
-                if skill in cv_lower:
-                    found_skills.append(skill.title())
-            
-            return found_skills
+            session.execute_write(self._run_unwind, self._UPSERT_PROFILES, rows)
     
     def create_person_profile(self, person_id, name, skills):
-        """Create a person node with their skills"""
-        with self.driver.session() as session:
-            # Create Person node
-            session.run("""
-                MERGE (p:Person {id: $person_id})
-                SET p.name = $name
-            """, person_id=person_id, name=name)
-            
-            # Link to skills
-            for skill in skills:
-                session.run("""
-                    MATCH (p:Person {id: $person_id})
-                    MERGE (s:Skill {name: $skill_name})
-                    MERGE (p)-[:HAS_SKILL]->(s)
-                """, person_id=person_id, skill_name=skill)
-            
-            print(f"✓ Created profile for {name} with {len(skills)} skills")
+        """Create a person node with their skills (one transaction)"""
+        row = self._profile_row(person_id, name, skills)
+        self._upsert_profiles([row])
+        print(f"✓ Created profile for {name} with {len(row['skills'])} skills")
+        
+        self._person_stats = None
+        self._index_profiles([(person_id, name, row["skills"])])
+    
+    def create_person_profiles(self, profiles, batch_size=500):
+        """Create many person nodes with their skills, batch_size profiles per transaction
+        
+        profiles: [{"person_id": ..., "name": ..., "skills": [...]}, ...]
+        """
+        rows = [self._profile_row(p["person_id"], p["name"], p["skills"]) for p in profiles]
+        # Sorted by ID so overlapping bulk writers also take Person locks in the same order
+        rows.sort(key=lambda r: r["id"])
+        for batch in self._batches(rows, batch_size):
+            self._upsert_profiles(batch)
+        
+        self._person_stats = None
+        self._index_profiles([(r["id"], r["name"], r["skills"]) for r in rows])
+        print(f"✓ Created {len(rows)} profiles with {sum(len(r['skills']) for r in rows)} skills")
     
     def evaluate_skills(self, person_skills):
-        """Evaluate skills against fields in the graph"""
-        with self.driver.session() as session:
-            evaluation = []
-            
-            # Get all fields
-            result = session.run("MATCH (f:Field) RETURN DISTINCT f.name as field")
-            fields = [record["field"] for record in result]
-            
-            print(f"🔍 Neo4j Query: Evaluating {len(person_skills)} skills against {len(fields)} fields in graph")
-            
-            for field in fields:
-                # Count matching skills for this field
-                match_query = """
-                    MATCH (s:Skill)-[:REQUIRED_FOR]->(f:Field {name: $field_name})
-                    WHERE s.name IN $person_skills
-                    RETURN count(s) as matched,
-                           collect(s.name) as matched_skills
-                """
-                print(f"  ↳ Neo4j: Checking field '{field}'")
-                
-                match_result = session.run(match_query, field_name=field, person_skills=person_skills)
-                match_data = match_result.single()
-                
-                # Get total required skills for field
-                total_query = """
-                    MATCH (s:Skill)-[:REQUIRED_FOR]->(f:Field {name: $field_name})
-                    RETURN count(s) as total,
-                           collect(s.name) as all_skills
-                """
-                total_result = session.run(total_query, field_name=field)
-                total_data = total_result.single()
-                
-                matched = match_data["matched"]
-                total = total_data["total"]
-                
-                if total > 0:
-                    score = (matched / total) * 100
-                    print(f"    ✓ {matched}/{total} skills matched ({score:.1f}%)")
-                    
-                    evaluation.append({
-                        "field": field,
-                        "matched_skills": match_data["matched_skills"],
-                        "total_required": total,
-                        "score": round(score, 1),
-                        "missing_skills": [s for s in total_data["all_skills"] 
-                                         if s not in person_skills]
-                    })
-            
-            # Sort by score
-            evaluation.sort(key=lambda x: x["score"], reverse=True)
-            print(f"✓ Neo4j: Best match is '{evaluation[0]['field']}' with {evaluation[0]['score']:.1f}%")
-            return evaluation
+        """Evaluate skills against fields in the graph
+        
+        Memoized per (graph version, skill set); the returned list is shared
+        between callers and must not be mutated.
+        """
+        snapshot = self.get_snapshot()
+        evaluation, cached = self.evaluation_service.evaluate(snapshot, person_skills)
+        if not cached:
+            print(f"🔍 Snapshot v{snapshot.version}: Evaluated {len(person_skills)} skills against {len(snapshot.fields)} fields")
+            if evaluation:
+                print(f"✓ Best match is '{evaluation[0]['field']}' with {evaluation[0]['score']:.1f}%")
+        return evaluation
+    
+    def get_field_distribution(self, person_skills):
+        """Number of the person's skills required by each field (derived from the shared evaluation)"""
+        return self.evaluation_service.field_distribution(self.get_snapshot(), person_skills)
     
-    def get_field_recommendations(self, person_skills):
-        """Get field recommendations based on skills"""
-        evaluation = self.evaluate_skills(person_skills)
+    def evaluate_skills_batch(self, skill_sets):
+        """Evaluate many skill sets at once (one vectorized scoring pass)"""
+        skill_sets = list(skill_sets)
+        snapshot = self.get_snapshot()
+        print(f"🔍 Snapshot v{snapshot.version}: Evaluating {len(skill_sets)} profiles against {len(snapshot.fields)} fields")
+        return snapshot.scorer().evaluate_many(skill_sets)
+    
+    def get_field_recommendations(self, person_skills, evaluation=None):
+        """Get field recommendations based on skills
+        
+        Pass an existing evaluation of person_skills to avoid re-evaluating.
+        """
+        if evaluation is None:
+            evaluation = self.evaluate_skills(person_skills)
         
         # Get top 3 matches
         top_matches = evaluation[:3]
@@ -190,58 +333,128 @@ class Neo4jSkillsManager:
         
         return recommendations
     
-    def find_similar_profiles(self, person_skills, limit=5):
-        """Find people with similar skill sets"""
+    # Slack for writes that commit after a refresh read past their timestamp
+    PROFILE_WATERMARK_SLACK_MS = 60000
+    
+    def _read_profiles(self, since=None):
+        """(id, name, skills, updated_at) of every Person, or only those updated after `since` (ms)"""
+        where = "WHERE p.updated_at > $since" if since is not None else ""
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (p:Person)-[:HAS_SKILL]->(s:Skill)
-                WHERE s.name IN $skills
-                WITH p, count(s) as common_skills
-                WHERE common_skills > 0
-                RETURN p.name as name, 
-                       p.id as id,
-                       common_skills
-                ORDER BY common_skills DESC
-                LIMIT $limit
-            """, skills=person_skills, limit=limit)
+            result = session.run(f"""
+                MATCH (p:Person) {where}
+                OPTIONAL MATCH (p)-[:HAS_SKILL]->(s:Skill)
+                RETURN p.id as id, p.name as name, collect(s.name) as skills, p.updated_at as updated_at
+            """, since=since)
+            return [(r["id"], r["name"], r["skills"], r["updated_at"] or 0) for r in result]
+    
+    def _get_profile_index(self):
+        """Similar-profile index, built on first use and refreshed when stale
+        
+        Refreshes only read Persons changed since the watermark. The read runs
+        outside the index lock and in one thread at a time; other callers keep
+        searching the current index meanwhile.
+        """
+        with self._profile_index_lock:
+            index = self._profile_index
+            if index is not None and time.monotonic() - self._profile_index_checked_at <= self.profile_refresh_interval:
+                return index
+        
+        # Only the very first build makes callers wait
+        if not self._profile_refresh_lock.acquire(blocking=index is None):
+            return index
+        try:
+            with self._profile_index_lock:
+                index = self._profile_index
+                since = self._profile_watermark
+                checked_at = self._profile_index_checked_at
+                rebuild = index is None or time.monotonic() - self._profile_index_built_at > self.profile_rebuild_interval
+            if index is not None and time.monotonic() - checked_at <= self.profile_refresh_interval:
+                return index
             
-            return [{"name": r["name"], "id": r["id"], "common_skills": r["common_skills"]} 
-                    for r in result]
+            started = time.monotonic()
+            profiles = self._read_profiles(None if rebuild else since - self.PROFILE_WATERMARK_SLACK_MS)
+            watermark = max([since if not rebuild else 0] + [updated_at for *_, updated_at in profiles])
+            with self._profile_index_lock:
+                if self._profile_index is not index:
+                    # Cleared meanwhile; the rows read may already be gone
+                    return self._profile_index
+                if rebuild:
+                    fresh = MinHashLSHIndex()
+                    for person_id, name, skills, _ in profiles:
+                        fresh.add(person_id, name, skills)
+                    self._profile_index = fresh
+                    self._profile_index_built_at = started
+                    print(f"✓ Neo4j: Indexed {len(fresh)} profiles for similarity search")
+                else:
+                    # The graph holds each profile's full skill set, so replace rather than merge
+                    for person_id, name, skills, _ in profiles:
+                        index.add(person_id, name, skills, merge=False)
+                self._profile_watermark = watermark
+                self._profile_index_checked_at = time.monotonic()
+                return self._profile_index
+        finally:
+            self._profile_refresh_lock.release()
+    
+    def _index_profiles(self, profiles):
+        """Fold freshly written (person_id, name, skills) into the index if it is built"""
+        with self._profile_index_lock:
+            if self._profile_index is None:
+                return
+            for person_id, name, skills in profiles:
+                self._profile_index.add(person_id, name, skills)
+    
+    def find_similar_profiles(self, person_skills, limit=5, exclude_id=None, rerank=True):
+        """Find people with similar skill sets
+        
+        Candidates come from MinHash/LSH buckets, so only profiles likely to
+        overlap are scored. With rerank the shortlist is ordered by exact
+        Jaccard similarity, otherwise by the signature estimate.
+        """
+        index = self._get_profile_index()
+        with self._profile_index_lock:
+            return index.query(person_skills, k=limit, rerank=rerank, exclude=exclude_id)
     
     def get_graph_stats(self):
         """Get graph statistics"""
-        with self.driver.session() as session:
-            stats = {}
-            
-            # Count nodes
-            result = session.run("MATCH (s:Skill) RETURN count(s) as count")
-            stats["skills"] = result.single()["count"]
-            
-            result = session.run("MATCH (f:Field) RETURN count(f) as count")
-            stats["fields"] = result.single()["count"]
-            
-            result = session.run("MATCH (p:Person) RETURN count(p) as count")
-            stats["people"] = result.single()["count"]
-            
-            # Count relationships
-            result = session.run("MATCH ()-[r:REQUIRED_FOR]->() RETURN count(r) as count")
-            stats["skill_field_links"] = result.single()["count"]
-            
-            result = session.run("MATCH ()-[r:HAS_SKILL]->() RETURN count(r) as count")
-            stats["person_skill_links"] = result.single()["count"]
-            
-            return stats
+        snapshot = self.get_snapshot()
+        stats = {
+            "skills": len(snapshot.skills),
+            "fields": len(snapshot.fields),
+            "skill_field_links": snapshot.edge_count
+        }
+        
+        # Person counts change with every CV, so they are cached separately
+        if self._person_stats is None:
+            with self.driver.session() as session:
+                result = session.run("""
+                    MATCH (p:Person)
+                    OPTIONAL MATCH (p)-[r:HAS_SKILL]->()
+                    RETURN count(DISTINCT p) as people, count(r) as links
+                """)
+                record = result.single()
+                self._person_stats = {"people": record["people"], "person_skill_links": record["links"]}
+        stats.update(self._person_stats)
+        
+        return stats
     
     def clear_all_data(self):
         """Clear all data from Neo4j"""
         with self.driver.session() as session:
             session.run("MATCH (n) DETACH DELETE n")
-            print("✓ Cleared all Neo4j data")
+        self.invalidate_snapshot()
+        with self._profile_index_lock:
+            # Nothing left to index; new profiles arrive through writes and refreshes
+            self._profile_index = MinHashLSHIndex()
+            self._profile_index_built_at = time.monotonic()
+            self._profile_index_checked_at = time.monotonic()
+            self._profile_watermark = 0
+        print("✓ Cleared all Neo4j data")
     
     def close(self):
         """Close Neo4j connection"""
-        if self.driver:
-            self.driver.close()
+        if self._driver:
+            resources.close_neo4j()
+            self._driver = None
             print("✓ Neo4j connection closed")
 
 # Global instance
@@ -1,20 +1,27 @@
 """
 RAG Pipeline - Retrieval Augmented Generation with Neo4j
 """
+import asyncio
 import os
-from typing import List, Optional
+import re
+from typing import Iterator, List, Optional
 from dotenv import load_dotenv
 from vector_store import VectorStore
-from langchain_groq import ChatGroq
+from answer_cache import SemanticAnswerCache
 from langchain_core.prompts import ChatPromptTemplate
 
 load_dotenv()
 
 class RAGPipeline:
-    def __init__(self, use_groq=True, neo4j_manager=None):
-        """Initialize RAG pipeline"""
-        self.vector_store = VectorStore()
+    def __init__(self, use_groq=True, neo4j_manager=None, vector_store=None, answer_cache=None):
+        """Initialize RAG pipeline
+        
+        Pass a shared vector_store to reuse its model and in-memory index, and
+        a shared answer_cache so answers are reused across sessions.
+        """
+        self.vector_store = vector_store if vector_store is not None else VectorStore()
         self.neo4j_manager = neo4j_manager
+        self.answer_cache = answer_cache if answer_cache is not None else self.create_answer_cache()
 
         # Initialize LLM (Groq or fallback to simple template)
         self.use_groq = use_groq
@@ -22,6 +29,7 @@ class RAGPipeline:
         groq_api_url = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
         if use_groq and groq_api_key:
             try:
+                from langchain_groq import ChatGroq
                 self.llm = ChatGroq(
                     model="llama-3.1-8b-instant",  # Updated to a supported Groq model
                     temperature=0.7,
@@ -61,16 +69,53 @@ Provide a detailed, personalized answer based on the user's skills and the avail
 )
         ])
     
-    def query_with_skills(self, question: str, user_skills: List[str]) -> dict:
-        """Query with skills context from Neo4j"""
-        if not self.neo4j_manager or not user_skills:
-            return self.query(question)
+    @staticmethod
+    def create_answer_cache():
+        """Answer cache configured from ANSWER_CACHE_THRESHOLD / _TTL / _SIZE"""
+        return SemanticAnswerCache(
+            threshold=float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.92")),
+            ttl=float(os.getenv("ANSWER_CACHE_TTL", "3600")),
+            max_entries=int(os.getenv("ANSWER_CACHE_SIZE", "1000"))
+        )
+    
+    def _cache_version(self, user_skills: List[str]):
+        """Data version a cached answer depends on
         
-        # Get recommendations from Neo4j
-        recommendations = self.neo4j_manager.get_field_recommendations(user_skills)
-        evaluation = self.neo4j_manager.evaluate_skills(user_skills)
+        Document-only answers depend on the corpus alone; skill answers also
+        on the skills graph (None when it can't be read, e.g. Neo4j is down).
+        Other processes' document writes are synced first, so a cache hit
+        can't serve an answer built before them.
+        """
+        self.vector_store.sync_index()
+        graph_version = None
+        if user_skills and self.neo4j_manager:
+            try:
+                graph_version = self.neo4j_manager.graph_version
+            except Exception as e:
+                print(f"⚠ Graph version unavailable: {e}")
+        return (graph_version, self.vector_store.version)
+    
+    def _cached_answer(self, question: str, user_skills: List[str], scope: str = ""):
+        """Embed the question and look it up
         
-        # Build graph context
+        Returns (embedding, version, cached response or None). Store the
+        answer under this version: it is the data the answer is built from,
+        even if other processes change it while the LLM is still running.
+        """
+        embedding = self.vector_store.embed_query(question)
+        version = self._cache_version(user_skills)
+        return embedding, version, self.answer_cache.lookup(user_skills, embedding, version, scope)
+    
+    def _remember_answer(self, user_skills: List[str], embedding, version, response: dict, scope: str = ""):
+        self.answer_cache.store(user_skills, embedding, response, version, scope)
+    
+    @staticmethod
+    def _retrieval_scope(retrieval_mode: str) -> str:
+        """Answer-cache scope: answers built from different retrieval modes are kept apart"""
+        return f"retrieval:{retrieval_mode}"
+    
+    def _build_graph_context(self, recommendations: List[dict]) -> str:
+        """Format the top field recommendations for the skills prompt"""
         graph_context = "Career Field Analysis:\n\n"
         
         for rec in recommendations[:3]:
@@ -80,32 +125,193 @@ Provide a detailed, personalized answer based on the user's skills and the avail
                 graph_context += f"- Skills to learn: {', '.join(rec['skills_to_learn'][:3])}\n"
             graph_context += "\n"
         
+        return graph_context
+    
+    def _skills_messages(self, question: str, user_skills: List[str], graph_context: str):
+        return self.skills_prompt_template.format_messages(
+            graph_context=graph_context,
+            user_skills=", ".join(user_skills),
+            question=question
+        )
+    
+    def query_with_skills(self, question: str, user_skills: List[str]) -> dict:
+        """Query with skills context from Neo4j"""
+        if not self.neo4j_manager or not user_skills:
+            return self.query(question)
+        
+        embedding, version, cached = self._cached_answer(question, user_skills)
+        if cached is not None:
+            return dict(cached)
+        
+        # Evaluate once and derive the recommendations from it
+        evaluation = self.neo4j_manager.evaluate_skills(user_skills)
+        recommendations = self.neo4j_manager.get_field_recommendations(user_skills, evaluation=evaluation)
+        
+        # Build graph context
+        graph_context = self._build_graph_context(recommendations)
+        
         # Generate answer using skills template
+        cacheable = True
         if self.use_groq:
             try:
-                messages = self.skills_prompt_template.format_messages(
-                    graph_context=graph_context,
-                    user_skills=", ".join(user_skills),
-                    question=question
-                )
-                response = self.llm.invoke(messages)
+                response = self.llm.invoke(self._skills_messages(question, user_skills, graph_context))
                 answer = response.content
             except Exception as e:
                 answer = f"Based on your skills analysis:\n\n{graph_context}"
+                cacheable = False
         else:
             answer = f"Based on your skills analysis:\n\n{graph_context}"
         
-        return {
+        result = {
             "answer": answer,
             "sources": [],
             "recommendations": recommendations,
             "evaluation": evaluation
         }
+        if cacheable:
+            self._remember_answer(user_skills, embedding, version, result)
+        return result
+    
+    @staticmethod
+    def _stream_text(text: str) -> Iterator[str]:
+        """Yield a precomputed answer word by word, like an LLM token stream"""
+        for match in re.finditer(r"\S+\s*|\s+", text):
+            yield match.group(0)
+    
+    def _stream_llm(self, messages, fallback: str, outcome: dict) -> Iterator[str]:
+        """Stream LLM tokens, falling back to the template answer if nothing arrived
+        
+        outcome["ok"] is set to False when the LLM failed.
+        """
+        streamed = False
+        outcome["ok"] = True
+        try:
+            for chunk in self.llm.stream(messages):
+                if chunk.content:
+                    streamed = True
+                    yield chunk.content
+        except Exception as e:
+            outcome["ok"] = False
+            if streamed:
+                yield f"\n\n⚠ Response interrupted: {e}"
+                return
+            yield from self._stream_text(fallback)
+    
+    def stream_query_with_skills(self, question: str, user_skills: List[str]) -> Iterator[str]:
+        """Streaming query_with_skills: yields answer text as it is generated"""
+        if not self.neo4j_manager or not user_skills:
+            yield from self.stream_query(question)
+            return
+        
+        embedding, version, cached = self._cached_answer(question, user_skills)
+        if cached is not None:
+            yield from self._stream_text(cached["answer"])
+            return
+        
+        evaluation = self.neo4j_manager.evaluate_skills(user_skills)
+        recommendations = self.neo4j_manager.get_field_recommendations(user_skills, evaluation=evaluation)
+        graph_context = self._build_graph_context(recommendations)
+        fallback = f"Based on your skills analysis:\n\n{graph_context}"
+        
+        outcome = {"ok": True}
+        tokens = []
+        stream = (self._stream_llm(self._skills_messages(question, user_skills, graph_context), fallback, outcome)
+                  if self.use_groq else self._stream_text(fallback))
+        for token in stream:
+            tokens.append(token)
+            yield token
+        
+        if outcome["ok"]:
+            self._remember_answer(user_skills, embedding, version, {
+                "answer": "".join(tokens),
+                "sources": [],
+                "recommendations": recommendations,
+                "evaluation": evaluation
+            })
+    
+    async def aquery_with_skills(self, question: str, user_skills: List[str], k: int = 4) -> dict:
+        """Async query_with_skills: graph evaluation and vector retrieval run concurrently
+        
+        Retrieved documents are added to the graph context and returned as sources.
+        """
+        if not self.neo4j_manager or not user_skills:
+            return await self.aquery(question, k=k)
+        
+        # Unlike the sync variants this answer includes retrieved documents, so it is cached apart
+        scope = f"skills+docs:{k}"
+        embedding, version, cached = await asyncio.to_thread(self._cached_answer, question, user_skills, scope)
+        if cached is not None:
+            return dict(cached)
+        
+        # The sync drivers block, so each lookup runs on its own worker thread
+        evaluation, relevant_docs = await asyncio.gather(
+            asyncio.to_thread(self.neo4j_manager.evaluate_skills, user_skills),
+            asyncio.to_thread(self.vector_store.similarity_search, question, k),
+            return_exceptions=True
+        )
+        if isinstance(evaluation, Exception):
+            raise evaluation
+        if isinstance(relevant_docs, Exception):
+            print(f"⚠ Retrieval failed, answering from the graph only: {relevant_docs}")
+            relevant_docs = []
+        recommendations = self.neo4j_manager.get_field_recommendations(user_skills, evaluation=evaluation)
+        
+        graph_context = self._build_graph_context(recommendations)
+        if relevant_docs:
+            graph_context += "Reference Documents:\n\n" + self._format_context(relevant_docs)
+        
+        cacheable = True
+        if self.use_groq:
+            try:
+                response = await self.llm.ainvoke(self._skills_messages(question, user_skills, graph_context))
+                answer = response.content
+            except Exception as e:
+                answer = f"Based on your skills analysis:\n\n{graph_context}"
+                cacheable = False
+        else:
+            answer = f"Based on your skills analysis:\n\n{graph_context}"
+        
+        result = {
+            "answer": answer,
+            "sources": self._format_sources(relevant_docs),
+            "recommendations": recommendations,
+            "evaluation": evaluation
+        }
+        if cacheable:
+            self._remember_answer(user_skills, embedding, version, result, scope)
+        return result
+    
+    @staticmethod
+    def _format_context(relevant_docs: List[dict]) -> str:
+        return "\n\n".join([
+            f"[Source: {doc['source']}]\n{doc['text']}"
+            for doc in relevant_docs
+        ])
+    
+    @staticmethod
+    def _format_sources(relevant_docs: List[dict]) -> List[dict]:
+        return [
+            {
+                "source": doc["source"],
+                "text": doc["text"][:200] + "...",
+                "similarity": doc["similarity"]
+            }
+            for doc in relevant_docs
+        ]
     
-    def query(self, question: str, k: int = 4) -> dict:
-        """Query the RAG pipeline"""
+    def query(self, question: str, k: int = 4, retrieval_mode: str = "dense") -> dict:
+        """Query the RAG pipeline
+        
+        retrieval_mode: "dense", "sparse" (BM25), "hybrid" (RRF of both) or
+        "shortlist" (BM25 candidates re-scored densely); see VectorStore.similarity_search.
+        """
+        scope = self._retrieval_scope(retrieval_mode)
+        embedding, version, cached = self._cached_answer(question, [], scope)
+        if cached is not None:
+            return dict(cached)
+
         # Retrieve relevant documents
-        relevant_docs = self.vector_store.similarity_search(question, k=k)
+        relevant_docs = self.vector_store.similarity_search(question, k=k, mode=retrieval_mode)
 
         if not relevant_docs:
             return {
@@ -114,12 +320,10 @@ Provide a detailed, personalized answer based on the user's skills and the avail
             }
 
         # Prepare context
-        context = "\n\n".join([
-            f"[Source: {doc['source']}]\n{doc['text']}"
-            for doc in relevant_docs
-        ])
+        context = self._format_context(relevant_docs)
 
         # Generate answer
+        cacheable = True
         if self.use_groq:
             try:
                 messages = self.prompt_template.format_messages(
@@ -130,18 +334,92 @@ Provide a detailed, personalized answer based on the user's skills and the avail
                 answer = response.content
             except Exception as e:
                 answer = f"Error generating response: {e}\n\nHere's the relevant context:\n{context[:500]}..."
+                cacheable = False
         else:
             # Simple template-based response
             answer = f"Based on the documents, here's what I found:\n\n{context[:1000]}...\n\n(Install Groq for better responses)"
 
-        return {
+        result = {
+            "answer": answer,
+            "sources": self._format_sources(relevant_docs)
+        }
+        if cacheable:
+            self._remember_answer([], embedding, version, result, scope)
+        return result
+    
+    def stream_query(self, question: str, k: int = 4, retrieval_mode: str = "dense") -> Iterator[str]:
+        """Streaming query: yields answer text as it is generated"""
+        scope = self._retrieval_scope(retrieval_mode)
+        embedding, version, cached = self._cached_answer(question, [], scope)
+        if cached is not None:
+            yield from self._stream_text(cached["answer"])
+            return
+        
+        relevant_docs = self.vector_store.similarity_search(question, k=k, mode=retrieval_mode)
+        if not relevant_docs:
+            yield "I couldn't find any relevant information in the knowledge base."
+            return
+        
+        context = self._format_context(relevant_docs)
+        outcome = {"ok": True}
+        if self.use_groq:
+            messages = self.prompt_template.format_messages(context=context, question=question)
+            fallback = f"Here's the relevant context:\n{context[:500]}..."
+            stream = self._stream_llm(messages, fallback, outcome)
+        else:
+            stream = self._stream_text(
+                f"Based on the documents, here's what I found:\n\n{context[:1000]}...\n\n(Install Groq for better responses)"
+            )
+        
+        tokens = []
+        for token in stream:
+            tokens.append(token)
+            yield token
+        
+        if outcome["ok"]:
+            self._remember_answer([], embedding, version, {
+                "answer": "".join(tokens),
+                "sources": self._format_sources(relevant_docs)
+            }, scope)
+    
+    async def aquery(self, question: str, k: int = 4, retrieval_mode: str = "dense") -> dict:
+        """Async version of query: retrieval off the event loop, LLM awaited with ainvoke"""
+        scope = self._retrieval_scope(retrieval_mode)
+        embedding, version, cached = await asyncio.to_thread(self._cached_answer, question, [], scope)
+        if cached is not None:
+            return dict(cached)
+        
+        relevant_docs = await asyncio.to_thread(
+            self.vector_store.similarity_search, question, k, mode=retrieval_mode
+        )
+        
+        if not relevant_docs:
+            return {
+                "answer": "I couldn't find any relevant information in the knowledge base.",
+                "sources": []
+            }
+        
+        context = self._format_context(relevant_docs)
+        
+        cacheable = True
+        if self.use_groq:
+            try:
+                messages = self.prompt_template.format_messages(
+                    context=context,
+                    question=question
+                )
+                response = await self.llm.ainvoke(messages)
+                answer = response.content
+            except Exception as e:
+                answer = f"Error generating response: {e}\n\nHere's the relevant context:\n{context[:500]}..."
+                cacheable = False
+        else:
+            answer = f"Based on the documents, here's what I found:\n\n{context[:1000]}...\n\n(Install Groq for better responses)"
+        
+        result = {
             "answer": answer,
-            "sources": [
-                {
-                    "source": doc["source"],
-                    "text": doc["text"][:200] + "...",
-                    "similarity": doc["similarity"]
-                }
-                for doc in relevant_docs
-            ]
+            "sources": self._format_sources(relevant_docs)
         }
+        if cacheable:
+            self._remember_answer([], embedding, version, result, scope)
+        return result
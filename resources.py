@@ -0,0 +1,140 @@
+"""
+Resource Manager - Process-wide database clients and embedding models
+"""
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+class ResourceManager:
+    def __init__(self):
+        """Lazily created, shared clients; nothing is imported or connected until first use
+        
+        Pool sizes and timeouts come from the environment:
+        MONGODB_MAX_POOL_SIZE, MONGODB_WAIT_QUEUE_TIMEOUT_MS, MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        NEO4J_MAX_POOL_SIZE, NEO4J_ACQUISITION_TIMEOUT, NEO4J_CONNECTION_TIMEOUT, NEO4J_MAX_RETRY_TIME.
+        After a failed Neo4j connect or ping, further attempts wait NEO4J_RETRY_COOLDOWN
+        seconds (doubling on repeated failures, up to 8x).
+        """
+        self._lock = threading.RLock()
+        # Separate locks so a slow model load or Neo4j connect doesn't block the other clients
+        self._model_lock = threading.Lock()
+        self._neo4j_lock = threading.Lock()
+        self._mongo_client = None
+        self._neo4j_driver = None
+        self.neo4j_retry_cooldown = float(os.getenv("NEO4J_RETRY_COOLDOWN", "15"))
+        self._neo4j_failures = 0
+        self._neo4j_retry_at = 0.0
+        self._models = {}
+    
+    def mongo_client(self):
+        """Shared MongoClient (pymongo pools connections internally)"""
+        with self._lock:
+            if self._mongo_client is None:
+                from pymongo import MongoClient
+                self._mongo_client = MongoClient(
+                    os.getenv("MONGODB_URI", "mongodb://localhost:27017/"),
+                    maxPoolSize=int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+                    waitQueueTimeoutMS=int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000")),
+                    serverSelectionTimeoutMS=int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+                )
+            return self._mongo_client
+    
+    def neo4j_retry_in(self):
+        """Seconds until Neo4j may be contacted again after a failure (0 when it may be now)"""
+        return max(self._neo4j_retry_at - time.monotonic(), 0.0)
+    
+    def _neo4j_failed(self):
+        """Start (or lengthen) the reconnect cooldown"""
+        self._neo4j_retry_at = time.monotonic() + self.neo4j_retry_cooldown * 2 ** min(self._neo4j_failures, 3)
+        self._neo4j_failures += 1
+    
+    def neo4j_driver(self):
+        """Shared Neo4j driver, verified on creation
+        
+        Raises ConnectionError without contacting the server while a
+        previous failure's cooldown is running.
+        """
+        if self._neo4j_driver is not None:
+            return self._neo4j_driver
+        with self._neo4j_lock:
+            if self._neo4j_driver is None:
+                retry_in = self.neo4j_retry_in()
+                if retry_in:
+                    raise ConnectionError(f"Neo4j unavailable (next retry in {retry_in:.0f}s)")
+                from neo4j import GraphDatabase
+                driver = GraphDatabase.driver(
+                    os.getenv("NEO4J_URI", "bolt://localhost:7687"),
+                    auth=(os.getenv("NEO4J_USERNAME", "neo4j"), os.getenv("NEO4J_PASSWORD", "password")),
+                    max_connection_pool_size=int(os.getenv("NEO4J_MAX_POOL_SIZE", "50")),
+                    connection_acquisition_timeout=float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "10")),
+                    connection_timeout=float(os.getenv("NEO4J_CONNECTION_TIMEOUT", "5")),
+                    max_transaction_retry_time=float(os.getenv("NEO4J_MAX_RETRY_TIME", "30"))
+                )
+                try:
+                    driver.verify_connectivity()
+                except Exception:
+                    driver.close()
+                    self._neo4j_failed()
+                    raise
+                self._neo4j_failures = 0
+                self._neo4j_driver = driver
+            return self._neo4j_driver
+    
+    def embedding_model(self, model_name="all-MiniLM-L6-v2"):
+        """SentenceTransformer loaded once per process and model name"""
+        with self._model_lock:
+            if model_name not in self._models:
+                # Heavy import (torch); deferred until a model is actually needed
+                from sentence_transformers import SentenceTransformer
+                self._models[model_name] = SentenceTransformer(model_name, device='cpu')
+                print(f"Loaded embedding model: {model_name}")
+            return self._models[model_name]
+    
+    def health(self):
+        """Ping each backend: {"mongodb": {...}, "neo4j": {...}} with ok, latency_ms and error"""
+        checks = {
+            "mongodb": lambda: self.mongo_client().admin.command("ping"),
+            "neo4j": self._ping_neo4j
+        }
+        report = {}
+        for name, check in checks.items():
+            start = time.perf_counter()
+            try:
+                check()
+                report[name] = {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 1), "error": None}
+            except Exception as e:
+                report[name] = {"ok": False, "latency_ms": None, "error": str(e)}
+        return report
+    
+    def _ping_neo4j(self):
+        # neo4j_driver() fails fast during the cooldown; a failed ping of a live driver starts one
+        driver = self.neo4j_driver()
+        try:
+            driver.verify_connectivity()
+        except Exception:
+            self._neo4j_failed()
+            raise
+        self._neo4j_failures = 0
+    
+    def close_mongo(self):
+        with self._lock:
+            if self._mongo_client is not None:
+                self._mongo_client.close()
+                self._mongo_client = None
+    
+    def close_neo4j(self):
+        with self._neo4j_lock:
+            if self._neo4j_driver is not None:
+                self._neo4j_driver.close()
+                self._neo4j_driver = None
+    
+    def close(self):
+        """Close every client (models stay loaded)"""
+        self.close_mongo()
+        self.close_neo4j()
+
+# Global instance
+resources = ResourceManager()
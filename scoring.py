@@ -0,0 +1,96 @@
+"""
+Field Scoring Engine - Vectorized skill-set vs field matching
+"""
+import numpy as np
+from bitops import row_popcount
+
+class FieldScorer:
+    def __init__(self, fields, skills, field_indptr, field_skills):
+        """Encode fields as a packed bit matrix and a dense incidence matrix
+        
+        field_indptr/field_skills are the CSR field -> skill-ID arrays of a
+        SkillGraphSnapshot.
+        """
+        self.fields = fields
+        self.skills = skills
+        self.skill_ids = {name: i for i, name in enumerate(skills)}
+        self.field_indptr = field_indptr
+        self.field_skills = field_skills
+        n_fields, n_skills = len(fields), len(skills)
+        
+        dense = np.zeros((n_fields, n_skills), dtype=bool)
+        rows = np.repeat(np.arange(n_fields), np.diff(field_indptr))
+        dense[rows, field_skills] = True
+        
+        # Packed rows for single-profile AND + popcount, float incidence for batched matmul
+        self.bits = np.packbits(dense, axis=1)
+        self.incidence = dense.T.astype(np.float32)
+        self.totals = dense.sum(axis=1).astype(np.int32)
+    
+    def _skill_vector(self, person_skills):
+        vector = np.zeros(len(self.skills), dtype=bool)
+        ids = [self.skill_ids[s] for s in person_skills if s in self.skill_ids]
+        vector[ids] = True
+        return vector
+    
+    def match_counts(self, person_skills):
+        """Matched-skill count per field for one profile (packed bitset popcount)"""
+        packed = np.packbits(self._skill_vector(person_skills))
+        return row_popcount(self.bits & packed)
+    
+    def match_counts_many(self, skill_sets, chunk_size=1024):
+        """(profiles x fields) matched-skill counts via one matmul per chunk"""
+        skill_sets = list(skill_sets)
+        counts = np.empty((len(skill_sets), len(self.fields)), dtype=np.int32)
+        for start in range(0, len(skill_sets), chunk_size):
+            chunk = skill_sets[start:start + chunk_size]
+            block = np.zeros((len(chunk), len(self.skills)), dtype=np.float32)
+            for row, person_skills in enumerate(chunk):
+                block[row, [self.skill_ids[s] for s in person_skills if s in self.skill_ids]] = 1.0
+            counts[start:start + len(chunk)] = np.rint(block @ self.incidence)
+        return counts
+    
+    def scores_many(self, skill_sets, chunk_size=1024):
+        """(profiles x fields) match percentages; fields without skills score 0"""
+        totals = np.maximum(self.totals, 1)
+        return self.match_counts_many(skill_sets, chunk_size) / totals * 100
+    
+    def top_fields_many(self, skill_sets, k=3, chunk_size=1024):
+        """Best k (field, score) pairs for each profile"""
+        scores = self.scores_many(skill_sets, chunk_size)
+        if scores.size == 0:
+            return [[] for _ in range(len(scores))]
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        ranked = np.take_along_axis(top, np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1), axis=1)
+        return [
+            [(self.fields[f], round(float(scores[row, f]), 1)) for f in ranked[row].tolist()]
+            for row in range(len(scores))
+        ]
+    
+    def _evaluation(self, person_skills, counts):
+        person_ids = {self.skill_ids[s] for s in person_skills if s in self.skill_ids}
+        evaluation = []
+        for field_id, (matched, total) in enumerate(zip(counts.tolist(), self.totals.tolist())):
+            if total == 0:
+                continue
+            ids = self.field_skills[self.field_indptr[field_id]:self.field_indptr[field_id + 1]].tolist()
+            evaluation.append({
+                "field": self.fields[field_id],
+                "matched_skills": [self.skills[i] for i in ids if i in person_ids],
+                "total_required": total,
+                "score": round(matched / total * 100, 1),
+                "missing_skills": [self.skills[i] for i in ids if i not in person_ids]
+            })
+        evaluation.sort(key=lambda x: x["score"], reverse=True)
+        return evaluation
+    
+    def evaluate(self, person_skills):
+        """Per-field match scores (same structure as Neo4jSkillsManager.evaluate_skills)"""
+        return self._evaluation(person_skills, self.match_counts(person_skills))
+    
+    def evaluate_many(self, skill_sets, chunk_size=1024):
+        """evaluate() for many profiles, scoring them in a single vectorized pass"""
+        skill_sets = list(skill_sets)
+        counts = self.match_counts_many(skill_sets, chunk_size)
+        return [self._evaluation(person_skills, row) for person_skills, row in zip(skill_sets, counts)]
@@ -0,0 +1,117 @@
+"""
+Similar Profile Index - MinHash signatures with LSH banding over skill sets
+"""
+import hashlib
+import numpy as np
+
+_PRIME = np.uint64((1 << 31) - 1)
+
+def _token_hash(token):
+    """Stable 31-bit hash of a skill name (Python's hash() is salted per process)"""
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % int(_PRIME)
+
+class MinHashLSHIndex:
+    def __init__(self, num_perm=128, bands=64, seed=1):
+        """num_perm hash functions split into `bands` bands of num_perm/bands rows
+        
+        More bands lowers the Jaccard level at which two profiles are likely
+        to share a bucket (about (1/bands) ** (1/rows)).
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+        self.clear()
+    
+    def __len__(self):
+        return len(self._profiles)
+    
+    def clear(self):
+        self._buckets = [{} for _ in range(self.bands)]
+        self._profiles = {}
+    
+    @staticmethod
+    def _normalize(skills):
+        return frozenset(skill.strip().lower() for skill in skills if skill and skill.strip())
+    
+    def signature(self, skills):
+        """MinHash signature of a (normalized) skill set"""
+        tokens = np.array([_token_hash(t) for t in skills], dtype=np.uint64)
+        if tokens.size == 0:
+            return None
+        hashed = (tokens[:, None] * self._a + self._b) % _PRIME
+        return hashed.min(axis=0)
+    
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+    
+    def remove(self, person_id):
+        profile = self._profiles.pop(person_id, None)
+        if profile is None or profile["band_keys"] is None:
+            return
+        for band, key in enumerate(profile["band_keys"]):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(person_id)
+                if not bucket:
+                    del self._buckets[band][key]
+    
+    def add(self, person_id, name, skills, merge=True):
+        """Index a profile; with merge=True the skills are added to any existing ones"""
+        skills = self._normalize(skills)
+        existing = self._profiles.get(person_id)
+        if existing is not None:
+            if merge:
+                skills = skills | existing["skills"]
+            self.remove(person_id)
+        
+        signature = self.signature(skills)
+        band_keys = self._band_keys(signature) if signature is not None else None
+        self._profiles[person_id] = {
+            "name": name,
+            "skills": skills,
+            "signature": signature,
+            "band_keys": band_keys
+        }
+        if band_keys is not None:
+            for band, key in enumerate(band_keys):
+                self._buckets[band].setdefault(key, set()).add(person_id)
+    
+    def query(self, skills, k=5, rerank=True, exclude=None):
+        """Top-k similar profiles by estimated (or, with rerank, exact) Jaccard"""
+        skills = self._normalize(skills)
+        signature = self.signature(skills)
+        if signature is None:
+            return []
+        
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+        candidates.discard(exclude)
+        if not candidates:
+            return []
+        
+        ids = list(candidates)
+        signatures = np.stack([self._profiles[i]["signature"] for i in ids])
+        estimated = (signatures == signature).mean(axis=1)
+        
+        results = []
+        for person_id, estimate in zip(ids, estimated.tolist()):
+            profile = self._profiles[person_id]
+            common = len(skills & profile["skills"])
+            if common == 0:
+                continue
+            similarity = common / len(skills | profile["skills"]) if rerank else estimate
+            results.append({
+                "name": profile["name"],
+                "id": person_id,
+                "common_skills": common,
+                "similarity": round(similarity, 3)
+            })
+        results.sort(key=lambda r: (r["similarity"], r["common_skills"]), reverse=True)
+        return results[:k]
@@ -0,0 +1,96 @@
+"""
+Skill Matcher - Aho-Corasick automaton for finding known skills in CV text
+"""
+from collections import deque
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+def _lower_same_length(text):
+    """Lowercase text without changing its length, so offsets stay valid"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+class SkillMatcher:
+    def __init__(self, skills):
+        """Compile skill names into a case-insensitive multi-pattern automaton"""
+        self.skills = sorted(set(skill for skill in skills if skill and skill.strip()))
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._patterns = []
+        
+        by_pattern = {}
+        for skill in self.skills:
+            by_pattern.setdefault(_lower_same_length(skill.strip()), []).append(skill)
+        for pattern, names in by_pattern.items():
+            self._add_pattern(pattern, names)
+        self._build_failure_links()
+    
+    def __len__(self):
+        return len(self.skills)
+    
+    def _add_pattern(self, pattern, names):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(len(self._patterns))
+        self._patterns.append((pattern, names))
+    
+    def _build_failure_links(self):
+        """Breadth-first pass linking each state to its longest proper suffix state"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+    
+    def _at_boundary(self, text, pattern, start, end):
+        """Word-boundary check, applied only on edges where the skill itself starts/ends with a word char"""
+        if _is_word_char(pattern[0]) and start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if _is_word_char(pattern[-1]) and end < len(text) and _is_word_char(text[end]):
+            return False
+        return True
+    
+    def find_all(self, text):
+        """Return every whole-word skill occurrence as {"skill", "start", "end"} in one pass"""
+        lowered = _lower_same_length(text)
+        matches = []
+        state = 0
+        for position, char in enumerate(lowered):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern_id in self._output[state]:
+                pattern, names = self._patterns[pattern_id]
+                end = position + 1
+                start = end - len(pattern)
+                if self._at_boundary(lowered, pattern, start, end):
+                    for name in names:
+                        matches.append({"skill": name, "start": start, "end": end})
+        matches.sort(key=lambda m: (m["start"], -m["end"]))
+        return matches
+    
+    def find_skills(self, text):
+        """Distinct matched skill names, in order of first occurrence"""
+        seen = {}
+        for match in self.find_all(text):
+            seen.setdefault(match["skill"], None)
+        return list(seen)
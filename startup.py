@@ -0,0 +1,57 @@
+"""
+Startup Profiler - Deferred initialization and import/init timings
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+class Startup:
+    def __init__(self):
+        """Process-wide record of how long startup steps took"""
+        self.timings = {}
+        self._warming = {}
+        self._lock = threading.Lock()
+    
+    def record(self, label, seconds):
+        """Keep the first measurement of each step (later ones are warm reruns)"""
+        with self._lock:
+            if label in self.timings:
+                return
+            self.timings[label] = seconds
+        print(f"⏱ {label}: {seconds * 1000:.0f} ms")
+    
+    @contextmanager
+    def timed(self, label):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(label, time.perf_counter() - start)
+    
+    def warm(self, name, fn, *args):
+        """Run fn(*args) once in a daemon thread so the first real use finds it ready"""
+        with self._lock:
+            if name in self._warming:
+                return
+            thread = threading.Thread(target=self._run, args=(name, fn, args), name=f"warm-{name}", daemon=True)
+            self._warming[name] = thread
+        thread.start()
+    
+    def _run(self, name, fn, args):
+        try:
+            with self.timed(f"warm {name}"):
+                fn(*args)
+        except Exception as e:
+            print(f"⚠ Warm-up of {name} failed: {e}")
+    
+    def is_warm(self, name):
+        thread = self._warming.get(name)
+        return thread is not None and not thread.is_alive()
+    
+    def report(self):
+        """{step: milliseconds} in the order the steps finished"""
+        with self._lock:
+            return {label: round(seconds * 1000, 1) for label, seconds in self.timings.items()}
+
+# Global instance
+startup = Startup()
@@ -0,0 +1,82 @@
+"""
+IndexSync against an in-memory MongoDB (mongomock)
+"""
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+pytest.importorskip("pymongo")
+
+from index_sync import IndexSync
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().db
+
+def make_sync(db, **kwargs):
+    return IndexSync(db.documents, db.index_meta, key="documents", **kwargs)
+
+def write(sync, texts, first_seq=None):
+    """Insert documents the way VectorStore does: reserve seqs, then stamp them"""
+    first_seq = sync.reserve(len(texts)) if first_seq is None else first_seq
+    result = sync.collection.insert_many([{"seq": first_seq + i, "text": t} for i, t in enumerate(texts)])
+    return result.inserted_ids
+
+def test_pending_returns_only_other_writers_documents(db):
+    writer, reader = make_sync(db), make_sync(db)
+    reader.mark_loaded(*reader.state())
+    
+    ids = write(writer, ["a", "b", "c"])
+    reset, new_ids = reader.pending(known_ids={ids[0]})
+    
+    assert not reset
+    assert new_ids == ids[1:]
+    assert reader.synced_seq == 3
+    assert reader.pending(known_ids=set(ids)) == (False, [])
+
+def test_gap_is_waited_for(db):
+    writer, reader = make_sync(db), make_sync(db)
+    reader.mark_loaded(*reader.state())
+    
+    # Two writers reserve 1-2 and 3-4; only the second has inserted so far
+    slow_seq = writer.reserve(2)
+    fast_ids = write(writer, ["c", "d"])
+    
+    reset, new_ids = reader.pending(known_ids=set())
+    assert not reset and new_ids == fast_ids
+    assert reader.synced_seq == 0
+    
+    # The slow writer lands while the gap is still being waited for
+    slow_ids = write(writer, ["a", "b"], first_seq=slow_seq)
+    reset, new_ids = reader.pending(known_ids=set(fast_ids))
+    assert new_ids == slow_ids
+    assert reader.synced_seq == 4
+
+def test_gap_is_skipped_after_timeout(db):
+    writer, reader = make_sync(db), make_sync(db, gap_timeout=0.0)
+    reader.mark_loaded(*reader.state())
+    
+    writer.reserve(2)  # reserved but never written (failed writer)
+    ids = write(writer, ["c"])
+    reader.pending(known_ids=set())
+    reset, new_ids = reader.pending(known_ids=set(ids))
+    
+    assert not reset and new_ids == []
+    assert reader.synced_seq == 3
+
+def test_epoch_bump_requests_full_reload(db):
+    writer, reader = make_sync(db), make_sync(db)
+    write(writer, ["a"])
+    reader.mark_loaded(*reader.state())
+    
+    writer.bump_epoch()
+    assert reader.pending(known_ids=set()) == (True, [])
+    
+    reader.mark_loaded(*reader.state())
+    assert reader.pending(known_ids=set()) == (False, [])
+
+def test_due_follows_poll_interval(db):
+    sync = make_sync(db, poll_interval=3600)
+    sync.pending(known_ids=set())
+    assert not sync.due()
+    sync._dirty.set()
+    assert sync.due()
@@ -0,0 +1,85 @@
+"""
+RAGPipeline answer caching with in-memory stand-ins for the stores
+"""
+import asyncio
+import threading
+import pytest
+
+pytest.importorskip("dotenv")
+pytest.importorskip("pymongo")
+pytest.importorskip("langchain_core")
+
+import numpy as np
+from rag_pipeline import RAGPipeline
+
+class FakeVectorStore:
+    def __init__(self):
+        self.version = 0
+        self.sync_threads = []
+    
+    def embed_query(self, text):
+        return np.ones(4, dtype=np.float32)
+    
+    def sync_index(self, force=False):
+        self.sync_threads.append(threading.get_ident())
+    
+    def similarity_search(self, query, k=4, **kwargs):
+        return [{"text": "Python guide", "metadata": {}, "source": "guide.md", "similarity": 0.9}]
+
+class FakeSkillsManager:
+    graph_version = 1
+    
+    def evaluate_skills(self, person_skills):
+        return [{"field": "Data Science", "matched_skills": list(person_skills), "total_required": 2,
+                 "score": 50.0, "missing_skills": ["SQL"]}]
+    
+    def get_field_recommendations(self, person_skills, evaluation=None):
+        return [{"field": "Data Science", "match_percentage": 50.0,
+                 "your_skills": list(person_skills), "skills_to_learn": ["SQL"]}]
+
+@pytest.fixture
+def pipeline():
+    return RAGPipeline(use_groq=False, neo4j_manager=FakeSkillsManager(), vector_store=FakeVectorStore())
+
+def test_query_with_skills_caches_on_a_cold_cache(pipeline):
+    first = pipeline.query_with_skills("Which field fits me?", ["Python"])
+    assert "Data Science" in first["answer"]
+    assert pipeline.answer_cache.stats()["entries"] == 1
+    
+    assert pipeline.query_with_skills("Which field fits me?", ["Python"]) == first
+    assert pipeline.answer_cache.stats()["hits"] == 1
+
+def test_async_skills_answers_are_cached_apart(pipeline):
+    sync_answer = pipeline.query_with_skills("Which field fits me?", ["Python"])
+    async_answer = asyncio.run(pipeline.aquery_with_skills("Which field fits me?", ["Python"]))
+    assert sync_answer["sources"] == []
+    assert async_answer["sources"][0]["source"] == "guide.md"
+
+def test_answer_is_stored_under_the_version_it_was_built_from(pipeline):
+    store = pipeline.vector_store
+    search = store.similarity_search
+    
+    def search_during_write(*args, **kwargs):
+        # Another process writes documents while this answer is being built
+        store.version += 1
+        return search(*args, **kwargs)
+    
+    store.similarity_search = search_during_write
+    pipeline.query("What is Python?")
+    store.similarity_search = search
+    pipeline.query("What is Python?")
+    assert pipeline.answer_cache.stats()["hits"] == 0
+
+@pytest.mark.parametrize("call", [
+    lambda pipeline: pipeline.aquery("What is Python?"),
+    lambda pipeline: pipeline.aquery_with_skills("Which field fits me?", ["Python"])
+])
+def test_async_queries_sync_the_index_off_the_event_loop(pipeline, call):
+    async def run():
+        await call(pipeline)
+        return threading.get_ident()
+    
+    loop_thread = asyncio.run(run())
+    # One version check per query (at lookup), never on the event loop thread
+    assert len(pipeline.vector_store.sync_threads) == 1
+    assert loop_thread not in pipeline.vector_store.sync_threads
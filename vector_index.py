@@ -0,0 +1,200 @@
+"""
+Vector Index - Resident in-memory index for fast similarity search
+"""
+import numpy as np
+from bitops import row_popcount
+
+class VectorIndex:
+    def __init__(self, mode="exact", n_lists=None, n_probe=8, min_train_size=2048,
+                 binary=False, rerank_factor=8):
+        """Initialize an empty index
+        
+        mode: "exact" for brute-force matmul, "ivf" for an inverted-file
+        approximate search that only scores the n_probe closest clusters.
+        binary: keep only packed sign bits; search shortlists k * rerank_factor
+        rows by Hamming distance and re-ranks them against the float query.
+        """
+        if mode not in ("exact", "ivf"):
+            raise ValueError(f"Unknown index mode: {mode}")
+        if binary and mode != "exact":
+            raise ValueError("Binary vectors are only supported in exact mode")
+        self.mode = mode
+        self.binary = binary
+        self.rerank_factor = rerank_factor
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self.clear()
+    
+    def __len__(self):
+        return self._size
+    
+    def __contains__(self, doc_id):
+        return doc_id in self._id_to_row
+    
+    def clear(self):
+        """Drop every vector from the index"""
+        self.dim = None
+        self._matrix = np.empty((0, 0), dtype=self._dtype)
+        self._size = 0
+        self.ids = []
+        self._id_to_row = {}
+        self._reset_ivf()
+    
+    @property
+    def _dtype(self):
+        return np.uint8 if self.binary else np.float32
+    
+    @property
+    def _width(self):
+        """Stored row width: dim floats, or dim bits packed into bytes"""
+        return -(-self.dim // 8) if self.binary else self.dim
+    
+    def _reset_ivf(self):
+        self._centroids = None
+        self._lists = None
+        self._trained_size = 0
+    
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+    
+    def _reserve(self, extra):
+        """Grow the backing matrix geometrically so appends stay amortized O(1)"""
+        needed = self._size + extra
+        capacity = self._matrix.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 1024)
+        matrix = np.empty((new_capacity, self._width), dtype=self._dtype)
+        matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+    
+    def add(self, ids, embeddings, packed_dim=None):
+        """Append vectors (one row per id) to the index
+        
+        A binary index also accepts already packed sign bits: pass them as
+        embeddings together with their unpacked dimension as packed_dim.
+        """
+        ids = list(ids)
+        if not ids:
+            return
+        if packed_dim is not None:
+            dim = packed_dim
+            vectors = np.asarray(embeddings, dtype=np.uint8).reshape(len(ids), -1)
+        else:
+            vectors = self._normalize(embeddings).reshape(len(ids), -1)
+            dim = vectors.shape[1]
+            if self.binary:
+                vectors = np.packbits(vectors > 0, axis=1)
+        if self.dim is None:
+            self.dim = dim
+            self._matrix = np.empty((0, self._width), dtype=self._dtype)
+        elif dim != self.dim:
+            raise ValueError(f"Expected {self.dim}-dim embeddings, got {dim}")
+        
+        self._reserve(len(ids))
+        start = self._size
+        self._matrix[start:start + len(ids)] = vectors
+        for offset, doc_id in enumerate(ids):
+            self._id_to_row[doc_id] = start + offset
+        self.ids.extend(ids)
+        self._size += len(ids)
+        
+        if self.mode == "ivf":
+            if self._centroids is not None and self._size <= 2 * self._trained_size:
+                self._assign(np.arange(start, self._size))
+            else:
+                self._reset_ivf()
+    
+    # ---- IVF (approximate) mode -------------------------------------------
+    
+    def _train(self, iterations=10, seed=0):
+        """Spherical k-means over a sample of the stored vectors"""
+        data = self._matrix[:self._size]
+        n_lists = self.n_lists or max(1, int(np.sqrt(self._size)))
+        rng = np.random.default_rng(seed)
+        sample_size = min(self._size, n_lists * 64)
+        sample = data[rng.choice(self._size, sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+        
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = sample[labels == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids = self._normalize(centroids)
+        
+        self._centroids = centroids
+        self._lists = [[] for _ in range(n_lists)]
+        self._trained_size = self._size
+        self._assign(np.arange(self._size))
+    
+    def _assign(self, rows):
+        labels = np.argmax(self._matrix[rows] @ self._centroids.T, axis=1)
+        for row, label in zip(rows.tolist(), labels.tolist()):
+            self._lists[label].append(row)
+    
+    def _candidate_rows(self, query):
+        if self._centroids is None:
+            self._train()
+        n_probe = min(self.n_probe, len(self._lists))
+        closest = np.argpartition(-(self._centroids @ query), n_probe - 1)[:n_probe]
+        rows = [row for c in closest for row in self._lists[c]]
+        return np.asarray(rows, dtype=np.int64)
+    
+    # ---- Binary (Hamming pre-filter) mode ---------------------------------
+    
+    def _search_binary(self, query, k, rows=None):
+        """Hamming shortlist over packed bits, re-ranked against the float query"""
+        bits = self._matrix[:self._size] if rows is None else self._matrix[rows]
+        distances = row_popcount(bits ^ np.packbits(query > 0))
+        n_candidates = min(len(bits), k * self.rerank_factor)
+        shortlist = np.argpartition(distances, n_candidates - 1)[:n_candidates]
+        # Cosine between the query and each candidate's +1/-1 sign vector
+        signs = np.unpackbits(bits[shortlist], axis=1, count=self.dim).astype(np.float32) * 2 - 1
+        return (shortlist if rows is None else rows[shortlist]), (signs @ query) / np.sqrt(self.dim)
+    
+    # ---- Search -----------------------------------------------------------
+    
+    def rows_for(self, ids):
+        """Index rows of the given ids (ids not in the index are skipped)"""
+        return np.fromiter(
+            (self._id_to_row[doc_id] for doc_id in ids if doc_id in self._id_to_row),
+            dtype=np.int64
+        )
+    
+    def search(self, query, k=4, rows=None):
+        """Return the top-k (id, cosine similarity) pairs for a query vector
+        
+        rows: optional array of index rows (see rows_for) to restrict the
+        search to, e.g. the documents matching a metadata filter.
+        """
+        if self._size == 0 or k <= 0 or (rows is not None and len(rows) == 0):
+            return []
+        query = self._normalize(query).reshape(-1)
+        
+        if self.binary:
+            rows, scores = self._search_binary(query, k, rows)
+        elif rows is not None:
+            # Filtered subsets are scored exactly, whatever the mode
+            scores = self._matrix[rows] @ query
+        elif self.mode == "ivf" and self._size >= self.min_train_size:
+            rows = self._candidate_rows(query)
+            scores = self._matrix[rows] @ query
+        else:
+            rows = None
+            scores = self._matrix[:self._size] @ query
+        
+        k = min(k, len(scores))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        if rows is not None:
+            return [(self.ids[rows[i]], float(scores[i])) for i in top]
+        return [(self.ids[i], float(scores[i])) for i in top]
@@ -2,59 +2,301 @@
 Vector Store Manager - Handle embeddings and similarity search
 """
 import os
-from typing import List, Dict
-from sentence_transformers import SentenceTransformer
+import threading
+import time
+from itertools import islice
+from typing import List, Dict, Iterable
 from mongodb_manager import mongo
+from resources import resources
+from vector_index import VectorIndex
+from embedding_cache import EmbeddingCache
+from index_sync import IndexSync
+from bm25_index import BM25Index, reciprocal_rank_fusion
+import embedding_codec
 import numpy as np
 
+RETRIEVAL_MODES = ("dense", "sparse", "hybrid", "shortlist")
+
 class VectorStore:
-    def __init__(self, model_name="all-MiniLM-L6-v2"):
-        """Initialize with a sentence transformer model"""
-        self.model = SentenceTransformer(model_name, device='cpu')
-        self.collection = mongo.get_collection("documents")
-        print(f"Loaded embedding model: {model_name}")
+    def __init__(self, model_name="all-MiniLM-L6-v2", index_mode="exact", encode_batch_size=64,
+                 embedding_format=None, collection=None, watch_changes=True):
+        """Initialize with a sentence transformer model (shared process-wide)
+        
+        embedding_format: how new embeddings are stored (float32, float16,
+        int8 or binary; default EMBEDDING_FORMAT or float32). With "binary"
+        the resident index keeps only sign bits and re-ranks a Hamming shortlist.
+        collection: documents collection to use instead of the configured
+        database (e.g. a mongomock collection); the embedding cache and sync
+        counter live in the same database.
+        watch_changes: tail a change stream to pick up other processes' writes
+        immediately (falls back to polling every VECTOR_SYNC_INTERVAL seconds).
+        """
+        self.embedding_format = embedding_format or os.getenv("EMBEDDING_FORMAT", "float32")
+        if self.embedding_format not in embedding_codec.FORMATS:
+            raise ValueError(f"Unknown embedding format: {self.embedding_format}")
+        self.model = resources.embedding_model(model_name)
+        self.encode_batch_size = encode_batch_size
+        self.collection = collection if collection is not None else mongo.get_collection("documents")
+        database = self.collection.database
+        self.embedding_cache = EmbeddingCache(model_name, collection=database["embedding_cache"])
+        # Resident index over the collection, loaded on first search
+        self.index = VectorIndex(mode=index_mode, binary=self.embedding_format == "binary")
+        self._index_loaded = False
+        # BM25 over document text, loaded on the first sparse/hybrid query
+        self.sparse_index = BM25Index()
+        self._sparse_loaded = False
+        self._hash_index_ready = False
+        self._filter_indexes = set()
+        # Delta sync with writes made by other processes
+        self.sync = IndexSync(self.collection, database["index_meta"], key="documents",
+                              poll_interval=float(os.getenv("VECTOR_SYNC_INTERVAL", "2")))
+        self.watch_changes = watch_changes
+        # Bumped on every change to the indexed corpus so caches built on search results can tell they are stale
+        self.version = 0
+        # Guards the resident indexes, their load/sync state and version (the store is shared by sessions)
+        self._lock = threading.RLock()
+    
+    def _index_docs(self, docs):
+        """Decode stored embeddings and append them to the resident index"""
+        if not docs:
+            return
+        ids = [doc["_id"] for doc in docs]
+        matrix = embedding_codec.decode_many(docs, self.embedding_format)
+        if self.index.binary:
+            self.index.add(ids, matrix, packed_dim=self.model.get_sentence_embedding_dimension())
+        else:
+            self.index.add(ids, matrix)
+        if self._sparse_loaded:
+            self.sparse_index.add(ids, [doc.get("text", "") for doc in docs])
+    
+    def _ensure_index(self):
+        """Load all embeddings into the in-memory index once, then apply deltas"""
+        with self._lock:
+            if self._index_loaded:
+                self.sync_index()
+                return
+            # Read the counter first so writes racing with the load are picked up by the next sync
+            epoch, seq = self.sync.state()
+            docs = list(self.collection.find({}, embedding_codec.PROJECTION))
+            self._index_docs([doc for doc in docs if doc["_id"] not in self.index])
+            self.sync.mark_loaded(epoch, seq)
+            self._index_loaded = True
+            print(f"✓ Indexed {len(docs)} documents in memory")
+        if self.watch_changes:
+            self.sync.start_watching()
+    
+    def sync_index(self, force=False):
+        """Apply other processes' writes to the resident index
+        
+        Only documents with a newer seq are fetched; a clear elsewhere
+        (epoch change) triggers a full reload. Returns the number of
+        documents added, or None when nothing was checked.
+        """
+        with self._lock:
+            if not self._index_loaded or not (force or self.sync.due()):
+                return None
+            reset, new_ids = self.sync.pending(self.index)
+            if reset:
+                self.index.clear()
+                self.sparse_index.clear()
+                self._index_loaded = False
+                self._sparse_loaded = False
+                self.version += 1
+                self._ensure_index()
+                return len(self.index)
+            if new_ids:
+                projection = dict(embedding_codec.PROJECTION, text=1) if self._sparse_loaded else embedding_codec.PROJECTION
+                self._index_docs(list(self.collection.find({"_id": {"$in": new_ids}}, projection)))
+                self.version += 1
+                print(f"✓ Synced {len(new_ids)} new documents into the index")
+            return len(new_ids)
+    
+    def _ensure_sparse_index(self):
+        """Build the BM25 index from every document's text once (kept current by writes and sync)"""
+        with self._lock:
+            if self._sparse_loaded:
+                return
+            docs = list(self.collection.find({}, {"text": 1}))
+            self.sparse_index.add([doc["_id"] for doc in docs], [doc.get("text", "") for doc in docs])
+            self._sparse_loaded = True
+            print(f"✓ Built BM25 index over {len(docs)} documents")
     
-    def add_documents(self, documents: List[dict]):
-        """Add documents with embeddings to MongoDB"""
-        for doc in documents:
-            # Generate embedding
-            embedding = self.model.encode(doc["text"]).tolist()
-            
-            # Store in MongoDB
-            doc_with_embedding = {
+    def encode_texts(self, texts: List[str], persist: bool = True) -> np.ndarray:
+        """Encode a list of texts, running the model only on cache misses
+        
+        persist=False keeps the embeddings in the in-process LRU only (used
+        for queries, so the search path never touches the disk cache).
+        """
+        keys = [self.embedding_cache.key(text) for text in texts]
+        cached = self.embedding_cache.get_many(keys, use_disk=persist)
+        
+        # Encode each distinct missing text once per call
+        missing = {}
+        for key, text, embedding in zip(keys, texts, cached):
+            if embedding is None and key not in missing:
+                missing[key] = text
+        if missing:
+            fresh = np.asarray(
+                self.model.encode(list(missing.values()), batch_size=self.encode_batch_size, convert_to_numpy=True),
+                dtype=np.float32
+            )
+            self.embedding_cache.put_many(list(missing), fresh, persist=persist)
+            by_key = dict(zip(missing, fresh))
+            cached = [embedding if embedding is not None else by_key[key]
+                      for key, embedding in zip(keys, cached)]
+        
+        return np.vstack(cached).astype(np.float32, copy=False)
+    
+    def embed_query(self, text: str) -> np.ndarray:
+        """Embedding of a single query string (served from the in-process cache when possible)"""
+        return self.encode_texts([text], persist=False)[0]
+    
+    def write_encoded_batch(self, documents: List[dict], embeddings: np.ndarray):
+        """Bulk insert one batch of documents and keep the index in sync
+        
+        embeddings (one row per document, e.g. from encode_texts) are stored
+        as given; callers that pipeline encoding and writing use this pair
+        instead of add_documents.
+        """
+        first_seq = self.sync.reserve(len(documents))
+        docs_with_embedding = [
+            {
+                "seq": first_seq + i,
                 "text": doc["text"],
                 "metadata": doc.get("metadata", {}),
                 "source": doc.get("source", ""),
-                "embedding": embedding
+                **embedding_codec.encode(embedding, self.embedding_format),
+                **({"content_hash": doc["content_hash"]} if "content_hash" in doc else {})
             }
-            
-            self.collection.insert_one(doc_with_embedding)
+            for i, (doc, embedding) in enumerate(zip(documents, embeddings))
+        ]
+        result = self.collection.insert_many(docs_with_embedding, ordered=False)
         
-        print(f"✓ Added {len(documents)} documents to vector store")
+        # Keep the resident index in sync (an unloaded index picks them up on load).
+        # A concurrent sync may have indexed some of these already, so skip those.
+        with self._lock:
+            self.version += 1
+            if self._index_loaded:
+                rows = [row for row, doc_id in enumerate(result.inserted_ids) if doc_id not in self.index]
+                if rows:
+                    self.index.add([result.inserted_ids[row] for row in rows], np.asarray(embeddings)[rows])
+            if self._sparse_loaded:
+                self.sparse_index.add(result.inserted_ids, [doc["text"] for doc in documents])
     
-    def similarity_search(self, query: str, k: int = 4) -> List[dict]:
-        """Find most similar documents to query"""
-        # Generate query embedding
-        query_embedding = self.model.encode(query)
-        
-        # Get all documents (for simple cosine similarity)
-        # In production, use MongoDB Atlas Vector Search
-        all_docs = list(self.collection.find())
-        
-        # Calculate cosine similarity
-        similarities = []
-        for doc in all_docs:
-            doc_embedding = np.array(doc["embedding"])
-            similarity = np.dot(query_embedding, doc_embedding) / (
-                np.linalg.norm(query_embedding) * np.linalg.norm(doc_embedding)
-            )
-            similarities.append((similarity, doc))
+    def existing_hashes(self, hashes: List[str]) -> set:
+        """The subset of content hashes already stored (used to skip duplicate chunks)"""
+        if not hashes:
+            return set()
+        if not self._hash_index_ready:
+            self.collection.create_index("content_hash", sparse=True)
+            self._hash_index_ready = True
+        return {
+            doc["content_hash"]
+            for doc in self.collection.find({"content_hash": {"$in": list(hashes)}}, {"content_hash": 1, "_id": 0})
+        }
+    
+    def add_documents(self, documents: Iterable[dict], batch_size: int = 256) -> Dict[str, float]:
+        """Add documents with embeddings to MongoDB
+        
+        Accepts any iterable (including generators); only one batch of
+        documents and embeddings is held in memory at a time.
+        """
+        start = time.perf_counter()
+        total = 0
+        iterator = iter(documents)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+            embeddings = self.encode_texts([doc["text"] for doc in batch])
+            self.write_encoded_batch(batch, embeddings)
+            total += len(batch)
+        
+        elapsed = time.perf_counter() - start
+        rate = total / elapsed if elapsed > 0 else 0.0
+        print(f"✓ Added {total} documents to vector store ({rate:.1f} docs/sec)")
+        return {"documents": total, "seconds": elapsed, "docs_per_sec": rate}
+    
+    @staticmethod
+    def _build_filter(source=None, metadata=None) -> dict:
+        """Mongo filter for a source (string or list) and metadata key/value pairs"""
+        query = {}
+        if source is not None:
+            query["source"] = {"$in": list(source)} if isinstance(source, (list, tuple, set)) else source
+        for key, value in (metadata or {}).items():
+            query[f"metadata.{key}"] = value
+        return query
+    
+    def _ensure_filter_indexes(self, query: dict):
+        """Index each filtered field once so Mongo resolves filters without a collection scan"""
+        for field in query:
+            if field not in self._filter_indexes:
+                self.collection.create_index(field)
+                self._filter_indexes.add(field)
+    
+    def similarity_search(self, query: str, k: int = 4, source=None, metadata: Dict = None,
+                          mode: str = "dense", candidates: int = None, rrf_k: int = 60) -> List[dict]:
+        """Find most similar documents to query
         
-        # Sort by similarity and return top k
-        similarities.sort(reverse=True, key=lambda x: x[0])
+        source / metadata restrict the search to matching documents. The
+        filter runs in Mongo (on indexed fields) and returns only _ids; the
+        resident index scores those rows and only the top-k payloads are fetched.
+        
+        mode: "dense" (embeddings), "sparse" (BM25 keyword match), "hybrid"
+        (reciprocal rank fusion of both lists of `candidates` hits) or
+        "shortlist" (BM25 picks `candidates` documents, embeddings re-score
+        them; falls back to dense when no keyword matches). "similarity" in
+        the results is the score of the chosen mode.
+        """
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        self._ensure_index()
+        if mode != "dense":
+            self._ensure_sparse_index()
+        candidates = candidates or max(4 * k, 20)
+        # Generate the query embedding before taking the index lock
+        query_embedding = self.embed_query(query) if mode != "sparse" else None
+        
+        matching = None
+        mongo_filter = self._build_filter(source, metadata)
+        if mongo_filter:
+            self._ensure_filter_indexes(mongo_filter)
+            matching = [doc["_id"] for doc in self.collection.find(mongo_filter, {"_id": 1})]
+        
+        def dense(limit, dense_rows):
+            return self.index.search(query_embedding, k=limit, rows=dense_rows)
+        
+        with self._lock:
+            rows = self.index.rows_for(matching) if matching is not None else None
+            allowed = set(matching) if matching is not None else None
+            if mode == "dense":
+                hits = dense(k, rows)
+            elif mode == "sparse":
+                hits = self.sparse_index.search(query, k, allowed)
+            elif mode == "hybrid":
+                hits = reciprocal_rank_fusion(
+                    [dense(candidates, rows), self.sparse_index.search(query, candidates, allowed)], rrf_k
+                )[:k]
+            else:
+                shortlist = self.sparse_index.search(query, candidates, allowed)
+                hits = dense(k, self.index.rows_for([doc_id for doc_id, _ in shortlist]) if shortlist else rows)
+        if not hits:
+            return []
+        
+        # Fetch only the winners' payloads
+        docs = {
+            doc["_id"]: doc
+            for doc in self.collection.find(
+                {"_id": {"$in": [doc_id for doc_id, _ in hits]}},
+                {"text": 1, "metadata": 1, "source": 1}
+            )
+        }
         
         results = []
-        for similarity, doc in similarities[:k]:
+        for doc_id, similarity in hits:
+            doc = docs.get(doc_id)
+            if doc is None:
+                continue
             results.append({
                 "text": doc["text"],
                 "metadata": doc.get("metadata", {}),
@@ -66,5 +308,13 @@ class VectorStore:
     
     def clear(self):
         """Clear all documents from the collection"""
-        self.collection.delete_many({})
+        with self._lock:
+            self.collection.delete_many({})
+            self.sync.bump_epoch()
+            self.index.clear()
+            self.sparse_index.clear()
+            self.sync.mark_loaded(*self.sync.state())
+            self._index_loaded = True
+            self._sparse_loaded = True
+            self.version += 1
         print("✓ Cleared vector store")